@@ -0,0 +1,38 @@
+"""Run every pipeline stage in one process, handing each stage's results to the next."""
+
+from __future__ import annotations
+
+import argparse
+
+from pipeline import changelog, charts, export, fit, ingest, transform
+
+
+def main(skip_ingest: bool = False, workers: int = 1, publish: bool = False) -> None:
+    sources_index = None if skip_ingest else ingest.main()
+    transform.main(workers=workers)
+    fits = fit.main(workers=workers)
+    changelog.main(fits=fits)
+    data = export.main(fits=fits, sources_index=sources_index, publish=publish)
+    charts.main(data=data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run ingest, transform, fit, changelog, export and charts")
+    parser.add_argument(
+        "--skip-ingest",
+        action="store_true",
+        help="reuse the sources already in data/sources",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes for sharded transforms and bootstrap fits",
+    )
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="export compact site data and build build/site for deployment",
+    )
+    args = parser.parse_args()
+    main(skip_ingest=args.skip_ingest, workers=args.workers, publish=args.publish)
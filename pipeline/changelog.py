@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Any
 
 from pipeline.common import PROCESSED_DIR, ensure_dirs, read_json
 
 
-def main() -> None:
+def main(fits: dict[str, Any] | None = None) -> None:
     ensure_dirs()
-    fits = read_json(PROCESSED_DIR / "fits.json")
+    if fits is None:
+        fits = read_json(PROCESSED_DIR / "fits.json")
     domains = sorted({row["domain"] for row in fits.get("domain_horizons", [])})
     models = sorted({row["model"] for row in fits.get("model_domain", [])})
 
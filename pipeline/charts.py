@@ -1,7 +1,6 @@
-"""Generate static PNG charts for the README from site/data.json."""
+"""Generate static PNG charts for the README from site/data.json and its shards."""
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 import matplotlib
@@ -10,6 +9,7 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 
 from pipeline.common import SITE_DIR
+from pipeline.export import load_site_data
 
 CHARTS_DIR = Path(__file__).resolve().parent.parent / "assets" / "charts"
 
@@ -53,8 +53,7 @@ def _init_style() -> None:
 
 
 def _load_data() -> dict:
-    path = SITE_DIR / "data.json"
-    return json.loads(path.read_text())
+    return load_site_data(SITE_DIR)
 
 
 def _label(domain: str) -> str:
@@ -371,10 +370,11 @@ def _empty_chart(name: str, msg: str) -> Path:
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
-def main() -> None:
+def main(data: dict | None = None) -> None:
     CHARTS_DIR.mkdir(parents=True, exist_ok=True)
     _init_style()
-    data = _load_data()
+    if data is None:
+        data = _load_data()
 
     p1 = chart_domain_horizons(data)
     print(f"  ✓ {p1}")
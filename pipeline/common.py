@@ -1,11 +1,29 @@
 from __future__ import annotations
 
+import dataclasses
+import hashlib
 import json
+import math
+import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Sequence
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import yaml
 
+# Optional faster JSON backends; ``JSON_BACKEND`` names the one in use.
+try:
+    import orjson
+except ImportError:  # both optional: pip install -e .[fast]
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
 
 ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = ROOT / "data"
@@ -14,6 +32,32 @@ PROCESSED_DIR = DATA_DIR / "processed"
 SNAPSHOTS_DIR = DATA_DIR / "snapshots"
 SITE_DIR = ROOT / "site"
 
+UNIFIED_JSONL = PROCESSED_DIR / "unified_records.jsonl"
+UNIFIED_PARQUET = PROCESSED_DIR / "unified_records.parquet"
+
+# Column layout of unified records; string columns are dictionary-encoded on disk.
+UNIFIED_SCHEMA = pa.schema(
+    [
+        ("benchmark", pa.string()),
+        ("domain", pa.string()),
+        ("subdomain", pa.string()),
+        ("model", pa.string()),
+        ("agent", pa.string()),
+        ("release_date", pa.string()),
+        ("human_minutes", pa.float64()),
+        ("score", pa.float64()),
+        ("score_binarized", pa.int64()),
+        ("tokens_count", pa.float64()),
+        ("generation_cost", pa.float64()),
+        ("source", pa.string()),
+    ]
+)
+CATEGORICAL_COLUMNS = ("benchmark", "domain", "subdomain", "model", "agent", "release_date", "source")
+UNIFIED_FIELDS = tuple(UNIFIED_SCHEMA.names)
+
+# Manifest statuses whose local file is current and safe to read downstream.
+USABLE_SOURCE_STATUSES = ("ok", "unchanged")
+
 
 def ensure_dirs() -> None:
     for path in (SOURCES_DIR, PROCESSED_DIR, SNAPSHOTS_DIR, SITE_DIR):
@@ -25,10 +69,331 @@ def load_registry() -> dict[str, Any]:
     return yaml.safe_load(registry_path.read_text())
 
 
-def write_json(path: Path, payload: Any) -> None:
+def _encode_default(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# json.dumps builds a new encoder per call for non-default options; reuse these instead.
+_STDLIB_ENCODERS = {
+    (indent, sort_keys): json.JSONEncoder(
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        allow_nan=False,
+        default=_encode_default,
+    )
+    for indent in (False, True)
+    for sort_keys in (False, True)
+}
+
+
+def _finite(value: Any) -> Any:
+    """``value`` with NaN and infinities replaced by None, as orjson and msgspec write them."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _finite(_encode_default(value))
+    return value
+
+
+def _stdlib_dumps(value: Any, indent: bool, sort_keys: bool) -> bytes:
+    encoder = _STDLIB_ENCODERS[indent, sort_keys]
+    try:
+        text = encoder.encode(value)
+    except ValueError:  # non-finite floats; rare, so only then pay for the copy
+        text = encoder.encode(_finite(value))
+    return text.encode("utf-8")
+
+
+def json_dumps(value: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Encode ``value`` as UTF-8 JSON with the fastest installed backend.
+
+    Values a fast backend cannot encode (e.g. integers beyond 64 bits) go through the
+    stdlib instead. Output is valid JSON either way, but its bytes depend on the
+    backend, so content hashes should be taken over the stdlib encoding. NaN and
+    infinities are written as ``null`` on every backend.
+    """
+    try:
+        if orjson is not None:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(value, option=option)
+        if msgspec is not None:
+            data = msgspec.json.encode(value, order="sorted" if sort_keys else None)
+            return msgspec.json.format(data, indent=2) if indent else data
+    except TypeError:
+        pass
+    return _stdlib_dumps(value, indent, sort_keys)
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON text or bytes, falling back to the stdlib for NaN/Infinity literals."""
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        if msgspec is not None:
+            return msgspec.json.decode(data)
+    except ValueError:
+        pass
+    # Decoding first skips the stdlib's encoding sniffing; our files are always UTF-8.
+    return json.loads(data.decode("utf-8") if isinstance(data, bytes) else data)
+
+
+def write_json(path: Path, payload: Any, compact: bool = False) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+    path.write_bytes(json_dumps(payload, indent=not compact, sort_keys=True))
 
 
 def read_json(path: Path) -> Any:
-    return json.loads(path.read_text())
+    return json_loads(path.read_bytes())
+
+
+JSONL_BUFFER_BYTES = 1 << 20
+
+
+def iter_jsonl(path: Path, record_type: type | None = None) -> Iterator[Any]:
+    """Stream the records of a JSON Lines file, skipping blank lines.
+
+    With ``record_type`` each line is decoded into that type instead of a dict:
+    directly by msgspec when it is installed (e.g. ``UnifiedRecord``), otherwise
+    by calling ``record_type(**row)``.
+    """
+    decode = json_loads
+    if record_type is not None:
+        if msgspec is not None:
+            decode = msgspec.json.Decoder(record_type).decode
+        else:
+
+            def decode(line: bytes) -> Any:
+                return record_type(**json_loads(line))
+
+    with path.open("rb", buffering=JSONL_BUFFER_BYTES) as handle:
+        for line in handle:
+            if line.strip():
+                yield decode(line)
+
+
+class JsonlWriter:
+    """Buffered JSON Lines writer; one ``write`` per record."""
+
+    def __init__(self, path: Path, buffer_size: int = JSONL_BUFFER_BYTES) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._handle = path.open("wb", buffering=buffer_size)
+        self.rows = 0
+
+    def write(self, record: Any) -> None:
+        self._handle.write(json_dumps(record) + b"\n")
+        self.rows += 1
+
+    def write_many(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+@dataclasses.dataclass(slots=True)
+class UnifiedRecord:
+    """One unified row as a slotted object, with its repeated strings interned.
+
+    Takes a fraction of the memory of the equivalent dict, and ``get``/``[]`` mirror
+    dict access, so code written against row dicts (including the JSONL and Parquet
+    writers) accepts records too. Fields follow ``UNIFIED_SCHEMA``.
+    """
+
+    benchmark: str
+    domain: str
+    subdomain: str
+    model: str
+    agent: str
+    release_date: str
+    human_minutes: float
+    score: float
+    score_binarized: int
+    tokens_count: float | None = None
+    generation_cost: float | None = None
+    source: str = ""
+
+    def __post_init__(self) -> None:
+        for name in CATEGORICAL_COLUMNS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+
+    @classmethod
+    def from_dict(cls, row: dict[str, Any]) -> "UnifiedRecord":
+        """A record from a unified row dict; keys outside the schema are ignored."""
+        return cls(*[row.get(name) for name in UNIFIED_FIELDS])
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> list["UnifiedRecord"]:
+        """Records for the rows of a unified DataFrame, with NaN read as ``None``."""
+        frame = frame.reindex(columns=list(UNIFIED_FIELDS))
+        values = frame.astype(object).where(frame.notna(), None)
+        return [cls(*row) for row in values.itertuples(index=False, name=None)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in UNIFIED_FIELDS}
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return getattr(self, name, default)
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UnifiedParquetWriter:
+    """Append unified rows to a Parquet file in bounded row groups."""
+
+    def __init__(
+        self,
+        path: Path,
+        batch_rows: int = 65_536,
+        schema: pa.Schema = UNIFIED_SCHEMA,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.batch_rows = batch_rows
+        self.schema = schema
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._writer = pq.ParquetWriter(
+            self._tmp_path,
+            schema,
+            use_dictionary=[name for name in CATEGORICAL_COLUMNS if name in schema.names],
+            compression="zstd",
+        )
+        self._columns: dict[str, list[Any]] = {name: [] for name in schema.names}
+        self._pending = 0
+
+    def append(self, row: dict[str, Any] | UnifiedRecord) -> None:
+        for name, values in self._columns.items():
+            values.append(row.get(name))
+        self._pending += 1
+        if self._pending >= self.batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        self._writer.write_batch(pa.RecordBatch.from_pydict(self._columns, schema=self.schema))
+        for values in self._columns.values():
+            values.clear()
+        self._pending = 0
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+        self._tmp_path.replace(self.path)
+
+    def __enter__(self) -> "UnifiedParquetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._writer.close()
+            self._tmp_path.unlink(missing_ok=True)
+
+
+def records_from_frame(frame: pd.DataFrame) -> list[dict[str, Any]]:
+    """Plain-Python row dicts, with NaN turned back into ``None``."""
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def _prefer_parquet(jsonl_path: Path, parquet_path: Path) -> bool:
+    return parquet_path.exists() and (
+        not jsonl_path.exists() or parquet_path.stat().st_mtime >= jsonl_path.stat().st_mtime
+    )
+
+
+def _cast_jsonl_frame(frame: pd.DataFrame, selected: list[str], categorical: list[str]) -> pd.DataFrame:
+    frame = frame.reindex(columns=selected)
+    dtypes = {name: UNIFIED_SCHEMA.field(name).type.to_pandas_dtype() for name in selected}
+    return frame.astype({**dtypes, **{name: "category" for name in categorical}})
+
+
+def load_unified_frame(
+    columns: Sequence[str] | None = None,
+    jsonl_path: Path | None = None,
+    parquet_path: Path | None = None,
+) -> pd.DataFrame:
+    """Load unified records as a typed DataFrame, reading only ``columns``.
+
+    Uses the Parquet copy when it is at least as new as the JSONL, otherwise parses
+    the JSONL. String columns come back as pandas categoricals either way.
+    """
+    jsonl_path = jsonl_path or UNIFIED_JSONL
+    parquet_path = parquet_path or UNIFIED_PARQUET
+    selected = list(columns) if columns is not None else list(UNIFIED_SCHEMA.names)
+    categorical = [name for name in selected if name in CATEGORICAL_COLUMNS]
+
+    if _prefer_parquet(jsonl_path, parquet_path):
+        return pd.read_parquet(parquet_path, columns=selected, read_dictionary=categorical)
+
+    frame = pd.read_json(
+        jsonl_path, lines=True, dtype=False, convert_dates=False, precise_float=True
+    )
+    return _cast_jsonl_frame(frame, selected, categorical)
+
+
+def iter_unified_frames(
+    columns: Sequence[str] | None = None,
+    batch_rows: int = 65_536,
+    jsonl_path: Path | None = None,
+    parquet_path: Path | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Stream unified records as DataFrames of at most ``batch_rows`` rows, in file order.
+
+    Same source choice and column types as ``load_unified_frame``, except that string
+    columns stay plain strings; memory is bounded by one batch. Yields nothing when
+    neither file exists.
+    """
+    jsonl_path = jsonl_path or UNIFIED_JSONL
+    parquet_path = parquet_path or UNIFIED_PARQUET
+    selected = list(columns) if columns is not None else list(UNIFIED_SCHEMA.names)
+
+    if _prefer_parquet(jsonl_path, parquet_path):
+        for batch in pq.ParquetFile(parquet_path).iter_batches(batch_size=batch_rows, columns=selected):
+            yield batch.to_pandas()
+        return
+    if not jsonl_path.exists():
+        return
+    with pd.read_json(
+        jsonl_path,
+        lines=True,
+        dtype=False,
+        convert_dates=False,
+        precise_float=True,
+        chunksize=batch_rows,
+    ) as reader:
+        for frame in reader:
+            yield _cast_jsonl_frame(frame, selected, [])
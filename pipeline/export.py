@@ -1,12 +1,31 @@
 from __future__ import annotations
 
-import json
+import argparse
+import hashlib
+import math
+import re
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Sequence
 
+import numpy as np
+import pandas as pd
 import yaml
 
-from pipeline.common import PROCESSED_DIR, SITE_DIR, SOURCES_DIR, ensure_dirs, read_json, write_json
+from pipeline.common import (
+    PROCESSED_DIR,
+    SITE_DIR,
+    SOURCES_DIR,
+    USABLE_SOURCE_STATUSES,
+    ensure_dirs,
+    iter_unified_frames,
+    json_dumps,
+    read_json,
+    records_from_frame,
+    write_json,
+)
+from pipeline.publish import publish as publish_site
+from pipeline.publish import quantize_floats
 
 
 # Approximate list prices ($ per 1M tokens) used only for scenario estimates.
@@ -61,7 +80,6 @@ SPLIT_RATIONALE_SOURCES = [
     "https://developers.openai.com/cookbook/examples/prompt_caching101/",
 ]
 
-
 def _headline_model_label(model_key: str) -> str:
     custom = {
         "claude_opus_4_6_inspect": "Claude Opus 4.6 (Inspect)",
@@ -78,17 +96,18 @@ def _headline_model_label(model_key: str) -> str:
     return model_key.replace("_", " ")
 
 
-def _build_metr_headline() -> dict:
-    index_path = SOURCES_DIR / "index.json"
-    if not index_path.exists():
-        return {"models": []}
+def _build_metr_headline(index: dict | None = None) -> dict:
+    if index is None:
+        index_path = SOURCES_DIR / "index.json"
+        if not index_path.exists():
+            return {"models": []}
+        index = read_json(index_path)
 
-    index = read_json(index_path)
     source = next(
         (
             item
             for item in index.get("items", [])
-            if item.get("parser") == "benchmark_results_yaml" and item.get("status") == "ok"
+            if item.get("parser") == "benchmark_results_yaml" and item.get("status") in USABLE_SOURCE_STATUSES
         ),
         None,
     )
@@ -135,96 +154,168 @@ def _build_metr_headline() -> dict:
     }
 
 
-def _load_jsonl(path) -> list[dict]:
-    rows: list[dict] = []
-    if not path.exists():
-        return rows
-    for line in path.read_text().splitlines():
-        if line.strip():
-            rows.append(json.loads(line))
-    return rows
-
-
-def _build_agent_economics(rows: list[dict]) -> dict:
-    by_model: dict[str, dict] = {}
-
-    for row in rows:
-        model = str(row.get("model") or "")
-        if not model or model.lower() == "human":
-            continue
-
-        tokens = row.get("tokens_count")
-        minutes = float(row.get("human_minutes") or 0.0)
-        success = int(row.get("score_binarized") or 0)
-        generation_cost = row.get("generation_cost")
-
-        if model not in by_model:
-            by_model[model] = {
-                "model": model,
-                "domains": set(),
-                "runs_total": 0,
-                "runs_with_tokens": 0,
-                "runs_success": 0,
-                "tokens_total": 0.0,
-                "minutes_total": 0.0,
-                "tokens_success": 0.0,
-                "minutes_success": 0.0,
-                "empirical_blended_rates": [],
-            }
-
-        item = by_model[model]
-        item["runs_total"] += 1
-        item["domains"].add(str(row.get("domain") or "unknown"))
+# Running sums behind ``agent_economics``; per-model figures are sums over domains.
+ECONOMICS_SUMS = {
+    "runs_total": "int64",
+    "runs_with_tokens": "int64",
+    "runs_success": "int64",
+    "tokens_total": "float64",
+    "minutes_total": "float64",
+    "tokens_success": "float64",
+    "minutes_success": "float64",
+    "blended_rate_sum": "float64",
+    "blended_rate_count": "int64",
+}
 
-        if isinstance(tokens, (int, float)) and tokens > 0 and minutes > 0:
-            item["runs_with_tokens"] += 1
-            item["tokens_total"] += float(tokens)
-            item["minutes_total"] += minutes
-            if success == 1:
-                item["runs_success"] += 1
-                item["tokens_success"] += float(tokens)
-                item["minutes_success"] += minutes
 
-            if isinstance(generation_cost, (int, float)) and generation_cost > 0:
-                item["empirical_blended_rates"].append(float(generation_cost) / float(tokens) * 1_000_000)
+def _canonical_codes(frame: pd.DataFrame, column: str, name) -> tuple[np.ndarray, list[str]]:
+    """Row codes into the distinct values of ``name(value)``, missing values included."""
+    codes, uniques = pd.factorize(frame[column])
+    names = [name(value) for value in uniques] + [name(None)]
+    canonical, labels = pd.factorize(pd.Series(names, dtype=object))
+    return canonical[codes], list(labels)  # code -1 (missing) picks the trailing name(None)
+
+
+def _economics_batch(frame: pd.DataFrame) -> pd.DataFrame:
+    """``ECONOMICS_SUMS`` of one batch of runs, indexed by (model, domain) in first-seen order.
+
+    Human and unnamed runs are skipped. Runs count towards token rates only with
+    positive tokens and minutes, and towards the empirical blended rate only with a
+    positive generation cost as well. Model and domain names are normalized once
+    per distinct value, and each sum is one ``np.bincount`` in run order.
+    """
+    model_codes, models = _canonical_codes(frame, "model", lambda value: str(value or ""))
+    domain_codes, domains = _canonical_codes(frame, "domain", lambda value: str(value or "unknown"))
+    skipped = np.array([not model or model.lower() == "human" for model in models])
+    keep = ~skipped[model_codes]
+
+    pairs = model_codes[keep] * len(domains) + domain_codes[keep]
+    pair_ids, pair_keys = pd.factorize(pairs)
+    index = pd.MultiIndex.from_arrays(
+        [[models[key // len(domains)] for key in pair_keys], [domains[key % len(domains)] for key in pair_keys]],
+        names=["model", "domain"],
+    )
 
+    def column(name: str) -> np.ndarray:
+        return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float)[keep]
+
+    minutes = np.nan_to_num(column("human_minutes"), nan=0.0)
+    tokens, cost = column("tokens_count"), column("generation_cost")
+    success = np.trunc(column("score_binarized")) == 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        with_tokens = (tokens > 0) & (minutes > 0)
+        with_success = with_tokens & success
+        with_cost = with_tokens & (cost > 0)
+        rates = cost / tokens * 1_000_000
+
+    n = len(pair_keys)
+    sums = {
+        "runs_total": np.bincount(pair_ids, minlength=n),
+        "runs_with_tokens": np.bincount(pair_ids[with_tokens], minlength=n),
+        "runs_success": np.bincount(pair_ids[with_success], minlength=n),
+        "tokens_total": np.bincount(pair_ids, np.where(with_tokens, tokens, 0.0), minlength=n),
+        "minutes_total": np.bincount(pair_ids, np.where(with_tokens, minutes, 0.0), minlength=n),
+        "tokens_success": np.bincount(pair_ids, np.where(with_success, tokens, 0.0), minlength=n),
+        "minutes_success": np.bincount(pair_ids, np.where(with_success, minutes, 0.0), minlength=n),
+        "blended_rate_sum": np.bincount(pair_ids, np.where(with_cost, rates, 0.0), minlength=n),
+        "blended_rate_count": np.bincount(pair_ids[with_cost], minlength=n),
+    }
+    return pd.DataFrame(sums, index=index).astype(ECONOMICS_SUMS)
+
+
+class EconomicsAccumulator:
+    """Running (model, domain) sums behind ``agent_economics``, fed a batch at a time.
+
+    Each batch is reduced to per-pair sums and added to the totals, so memory grows
+    with the number of models and domains, not runs. ``result`` sums the domains of
+    each model; ``domain_results`` reports the same figures for each domain.
+    """
+
+    def __init__(self) -> None:
+        self.totals: pd.DataFrame | None = None
+
+    def update(self, frame: pd.DataFrame) -> None:
+        batch = _economics_batch(frame)
+        if self.totals is not None:
+            # sort=False keeps (model, domain) pairs, and so models, in first-seen order.
+            batch = pd.concat([self.totals, batch]).groupby(level=["model", "domain"], sort=False).sum()
+        self.totals = batch
+
+    def _per_model(self, totals: pd.DataFrame) -> pd.DataFrame:
+        per_model = totals.groupby(level="model", sort=False).sum()
+        domains: dict[str, list[str]] = {}
+        for model, domain in totals.index:
+            domains.setdefault(model, []).append(domain)
+        return per_model.assign(domains=[sorted(domains[model]) for model in per_model.index])
+
+    def result(self) -> dict:
+        if self.totals is None:
+            return _economics_section(pd.DataFrame(columns=[*ECONOMICS_SUMS, "domains"]))
+        return _economics_section(self._per_model(self.totals))
+
+    def domain_results(self) -> dict[str, list[dict]]:
+        """``agent_economics`` model rows restricted to each domain, keyed by domain.
+
+        Not part of the exported site data; ``main`` only writes ``result``.
+        """
+        if self.totals is None:
+            return {}
+        return {
+            domain: _economics_section(self._per_model(totals))["models"]
+            for domain, totals in self.totals.groupby(level="domain", sort=True)
+        }
+
+
+def _optional(values: pd.Series) -> list:
+    return [None if pd.isna(value) else float(value) for value in values]
+
+
+def _economics_section(per_model: pd.DataFrame) -> dict:
+    """The ``agent_economics`` section from per-model ``ECONOMICS_SUMS`` and domain lists."""
+    minutes, success_minutes = per_model["minutes_total"], per_model["minutes_success"]
+    tokens_per_min = (per_model["tokens_total"] / minutes).where(minutes > 0)
+    tokens_per_success_min = (per_model["tokens_success"] / success_minutes).where(success_minutes > 0)
+    rate_count = per_model["blended_rate_count"]
+    empirical_rate = (per_model["blended_rate_sum"] / rate_count).where(rate_count > 0)
+
+    pricing = [MODEL_PRICING_PER_1M.get(model) for model in per_model.index]
+    priced = pd.Series([p is not None for p in pricing], index=per_model.index) & tokens_per_success_min.notna()
+    price_in = pd.Series([p["input"] if p else np.nan for p in pricing], index=per_model.index, dtype=float)
+    price_out = pd.Series([p["output"] if p else np.nan for p in pricing], index=per_model.index, dtype=float)
+    scenarios = {}
+    for key, preset in SPLIT_PRESETS.items():
+        blended = preset["input_share"] * price_in + preset["output_share"] * price_out
+        scenarios[key] = (blended, tokens_per_success_min * 60.0 * blended / 1_000_000)
+
+    columns = {
+        "tokens_per_minute": _optional(tokens_per_min),
+        "tokens_per_hour": _optional(tokens_per_min * 60.0),
+        "tokens_per_success_minute": _optional(tokens_per_success_min),
+        "tokens_per_success_hour": _optional(tokens_per_success_min * 60.0),
+        "empirical_blended_usd_per_1m_from_runs": _optional(empirical_rate),
+    }
     models = []
-    for item in by_model.values():
-        tokens_per_min = (
-            item["tokens_total"] / item["minutes_total"] if item["minutes_total"] > 0 else None
-        )
-        tokens_per_success_min = (
-            item["tokens_success"] / item["minutes_success"] if item["minutes_success"] > 0 else None
-        )
-
-        pricing = MODEL_PRICING_PER_1M.get(item["model"])
+    for i, model in enumerate(per_model.index):
         cost_estimates = {}
-        if pricing and tokens_per_success_min is not None:
-            for key, preset in SPLIT_PRESETS.items():
-                blended = preset["input_share"] * pricing["input"] + preset["output_share"] * pricing["output"]
-                usd_per_success_hour = tokens_per_success_min * 60.0 * blended / 1_000_000
+        if priced.iloc[i]:
+            for key, (blended, usd_per_hour) in scenarios.items():
                 cost_estimates[key] = {
-                    "blended_usd_per_1m_tokens": blended,
-                    "usd_per_autonomous_hour": usd_per_success_hour,
+                    "blended_usd_per_1m_tokens": float(blended.iloc[i]),
+                    "usd_per_autonomous_hour": float(usd_per_hour.iloc[i]),
                 }
-
         models.append(
             {
-                "model": item["model"],
-                "domains": sorted(item["domains"]),
-                "runs_total": item["runs_total"],
-                "runs_with_tokens": item["runs_with_tokens"],
-                "runs_success": item["runs_success"],
-                "tokens_per_minute": tokens_per_min,
-                "tokens_per_hour": tokens_per_min * 60.0 if tokens_per_min is not None else None,
-                "tokens_per_success_minute": tokens_per_success_min,
-                "tokens_per_success_hour": tokens_per_success_min * 60.0 if tokens_per_success_min is not None else None,
-                "assumed_price_usd_per_1m": pricing,
-                "empirical_blended_usd_per_1m_from_runs": (
-                    sum(item["empirical_blended_rates"]) / len(item["empirical_blended_rates"])
-                    if item["empirical_blended_rates"]
-                    else None
-                ),
+                "model": model,
+                "domains": per_model["domains"].iloc[i],
+                "runs_total": int(per_model["runs_total"].iloc[i]),
+                "runs_with_tokens": int(per_model["runs_with_tokens"].iloc[i]),
+                "runs_success": int(per_model["runs_success"].iloc[i]),
+                "tokens_per_minute": columns["tokens_per_minute"][i],
+                "tokens_per_hour": columns["tokens_per_hour"][i],
+                "tokens_per_success_minute": columns["tokens_per_success_minute"][i],
+                "tokens_per_success_hour": columns["tokens_per_success_hour"][i],
+                "assumed_price_usd_per_1m": pricing[i],
+                "empirical_blended_usd_per_1m_from_runs": columns["empirical_blended_usd_per_1m_from_runs"][i],
                 "estimated_cost_scenarios": cost_estimates,
             }
         )
@@ -248,19 +339,224 @@ def _build_agent_economics(rows: list[dict]) -> dict:
     }
 
 
-def main() -> None:
+SAMPLE_ROWS = 500
+SAMPLE_STRATA = ("domain", "model")
+SAMPLE_SEED = 20250301
+
+
+def _stratum_quota(counts: list[int], size: int) -> int:
+    """Largest per-stratum cap ``q`` with ``sum(min(count, q)) <= size`` (at least 1)."""
+    remaining = size
+    ordered = sorted(counts)
+    for i, count in enumerate(ordered):
+        share = remaining // (len(ordered) - i)
+        if count > share:
+            return max(share, 1)
+        remaining -= count
+    return max(ordered, default=1)
+
+
+def _by_key(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.iloc[np.lexsort((frame["_order"].to_numpy(), frame["_key"].to_numpy()))]
+
+
+class StratifiedSample:
+    """A deterministic, stratified sample of unified rows for the explorer table.
+
+    Every row gets a pseudo-random key by hashing its content with ``seed``; each
+    stratum contributes its rows with the smallest keys, up to a cap that shares
+    ``size`` as evenly as the stratum sizes allow, and slots the integer cap leaves
+    over go to the smallest keys just past it. The cap only shrinks as rows arrive,
+    so one pass holding at most ``size`` plus one row per stratum gives the same
+    sample as sorting everything, and the sample does not move between runs over
+    the same data.
+    """
+
+    def __init__(
+        self,
+        size: int = SAMPLE_ROWS,
+        strata: Sequence[str] = SAMPLE_STRATA,
+        seed: int = SAMPLE_SEED,
+    ) -> None:
+        self.size = size
+        self.strata = list(strata)
+        self.hash_key = f"{seed:016d}"[-16:]
+        self.counts: dict[tuple, int] = {}
+        self.kept: pd.DataFrame | None = None
+        self.seen = 0
+
+    def update(self, frame: pd.DataFrame) -> None:
+        if frame.empty or self.size <= 0:
+            return
+        # The key is followed by the row's position, so duplicate rows still sort apart.
+        keyed = frame.assign(
+            _key=pd.util.hash_pandas_object(frame, index=False, hash_key=self.hash_key).to_numpy(),
+            _order=np.arange(self.seen, self.seen + len(frame)),
+        )
+        self.seen += len(frame)
+        for stratum, count in keyed.groupby(self.strata, sort=False, dropna=False).size().items():
+            values = stratum if isinstance(stratum, tuple) else (stratum,)
+            stratum = tuple(None if pd.isna(value) else value for value in values)
+            self.counts[stratum] = self.counts.get(stratum, 0) + int(count)
+
+        candidates = keyed if self.kept is None else pd.concat([self.kept, keyed], ignore_index=True)
+        quota = _stratum_quota(list(self.counts.values()), self.size)
+        # One row past the cap per stratum is kept for the leftover slots.
+        self.kept = _by_key(candidates).groupby(self.strata, sort=False, dropna=False).head(quota + 1)
+
+    @property
+    def rows(self) -> list[dict]:
+        """The sample as plain dicts in key order, which interleaves the strata."""
+        if self.kept is None:
+            return []
+        quota = _stratum_quota(list(self.counts.values()), self.size)
+        kept = _by_key(self.kept)
+        rank = kept.groupby(self.strata, sort=False, dropna=False).cumcount()
+        chosen = kept[rank < quota].head(self.size)
+        extra = kept[rank == quota].head(self.size - len(chosen))
+        sample = _by_key(pd.concat([chosen, extra]))
+        return records_from_frame(sample.drop(columns=["_key", "_order"]).reset_index(drop=True))
+
+
+def scan_unified_records(*consumers) -> None:
+    """Feed every batch of unified records to each consumer's ``update``, in one pass."""
+    for frame in iter_unified_frames():
+        for consumer in consumers:
+            consumer.update(frame)
+
+
+SHARDS_DIR = SITE_DIR / "data"
+SHARD_HASH_LENGTH = 12
+SHARD_PATTERN = re.compile(r"^[a-z0-9_-]+\.[0-9a-f]{%d}\.json$" % SHARD_HASH_LENGTH)
+
+# Payload keys moved out of data.json into shards the front end fetches on demand.
+SHARDED_KEYS = ("curves", "table_rows", "agent_economics")
+
+
+def _success_near(points: list[dict], minutes: float = 60.0) -> float | None:
+    """Smoothed success of the curve point closest to ``minutes`` (first one on ties)."""
+    best = None
+    best_distance = math.inf
+    for point in points:
+        distance = abs(point["minutes"] - minutes)
+        if distance < best_distance:
+            best, best_distance = point, distance
+    if best is None:
+        return None
+    value = best.get("success_smoothed")
+    if value is None:
+        value = best.get("success")
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return value
+
+
+def _shard_slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9_]+", "-", name.lower()).strip("-") or "shard"
+
+
+def write_shard(name: str, value: Any, shard_dir: Path = SHARDS_DIR) -> str:
+    """Write ``value`` as ``<name>.<content hash>.json``; returns its path relative to the site.
+
+    The name changes whenever the content does, so the file can be cached forever.
+    Non-finite floats are written as ``null``, as in ``data.json``.
+    """
+    data = json_dumps(value, sort_keys=True)
+    digest = hashlib.sha256(data).hexdigest()[:SHARD_HASH_LENGTH]
+    path = shard_dir / f"{_shard_slug(name)}.{digest}.json"
+    if not path.exists():
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    return f"{shard_dir.name}/{path.name}"
+
+
+def write_site_data(payload: dict, site_dir: Path = SITE_DIR, compact: bool = False) -> dict:
+    """Split ``payload`` into ``data.json`` and content-hashed shards; returns the manifest.
+
+    ``data.json`` keeps the headline data the first charts need, plus a ``shards`` map:
+    one curves shard per domain, the explorer table, and the agent economics.
+    Shards no longer referenced are removed.
+    """
+    shard_dir = site_dir / SHARDS_DIR.name
+    curves_by_domain: dict[str, list[dict]] = {}
+    for curve in payload.get("curves", []):
+        curves_by_domain.setdefault(str(curve.get("domain", "")), []).append(curve)
+    shards = {
+        "curves": {
+            domain: write_shard(f"curves-{domain}", curves, shard_dir)
+            for domain, curves in sorted(curves_by_domain.items())
+        },
+        "table": write_shard("table", payload.get("table_rows", []), shard_dir),
+        "economics": write_shard("economics", payload.get("agent_economics", {}), shard_dir),
+    }
+
+    # The bubble chart only needs each curve's success near one hour, so that value
+    # travels with the model/domain rows and the first chart waits for no shard.
+    success_60 = {
+        (curve.get("model"), curve.get("domain")): _success_near(curve.get("points") or [])
+        for curve in payload.get("curves", [])
+    }
+    manifest = {key: value for key, value in payload.items() if key not in SHARDED_KEYS}
+    manifest["model_domain"] = [
+        {**row, "success_near_60_minutes": success_60.get((row.get("model"), row.get("domain")))}
+        for row in payload.get("model_domain", [])
+    ]
+    manifest["shards"] = shards
+    write_json(site_dir / "data.json", manifest, compact=compact)
+
+    referenced = {Path(path).name for path in [*shards["curves"].values(), shards["table"], shards["economics"]]}
+    for path in shard_dir.glob("*.json"):
+        if SHARD_PATTERN.match(path.name) and path.name not in referenced:
+            path.unlink()
+    return manifest
+
+
+def load_site_data(site_dir: Path = SITE_DIR) -> dict:
+    """Reassemble the full export payload from ``data.json`` and its shards.
+
+    Curves come back grouped by domain in domain order.
+    """
+    manifest = read_json(site_dir / "data.json")
+    shards = manifest.pop("shards", None)
+    if shards is None:
+        return manifest
+    payload = dict(manifest)
+    payload["model_domain"] = [
+        {key: value for key, value in row.items() if key != "success_near_60_minutes"}
+        for row in manifest.get("model_domain", [])
+    ]
+    payload["curves"] = [
+        curve for path in shards.get("curves", {}).values() for curve in read_json(site_dir / path)
+    ]
+    payload["table_rows"] = read_json(site_dir / shards["table"])
+    payload["agent_economics"] = read_json(site_dir / shards["economics"])
+    return payload
+
+
+def main(
+    fits: dict | None = None,
+    sources_index: dict | None = None,
+    publish: bool = False,
+    sample_size: int = SAMPLE_ROWS,
+    sample_strata: Sequence[str] = SAMPLE_STRATA,
+) -> dict:
+    """Write ``site/data.json`` and its shards, and return the full payload.
+
+    ``fits`` and ``sources_index`` are the ``fit`` and ``ingest`` results when the
+    pipeline runs in one process; otherwise they are read from disk. ``publish``
+    writes compact, quantized JSON and builds the deployable site in ``build/site``.
+    The explorer table gets ``sample_size`` rows stratified by ``sample_strata``.
+    """
     ensure_dirs()
-    fits = read_json(PROCESSED_DIR / "fits.json")
-    unified_rows = _load_jsonl(PROCESSED_DIR / "unified_records.jsonl")
-
-    sample_records = []
-    unified_path = PROCESSED_DIR / "unified_records.jsonl"
-    if unified_path.exists():
-        for i, line in enumerate(unified_path.read_text().splitlines()):
-            if i >= 500:
-                break
-            if line.strip():
-                sample_records.append(json.loads(line))
+    if fits is None:
+        fits = read_json(PROCESSED_DIR / "fits.json")
+
+    economics = EconomicsAccumulator()
+    sample = StratifiedSample(sample_size, sample_strata)
+    scan_unified_records(economics, sample)
+    sample_records = sample.rows
 
     domain_by_name = {item["domain"]: item for item in fits.get("domain_horizons", [])}
 
@@ -269,18 +565,43 @@ def main() -> None:
         "domain_horizons": fits.get("domain_horizons", []),
         "model_domain": fits.get("model_domain", []),
         "curves": fits.get("curves", []),
-        "metr_headline": _build_metr_headline(),
+        "metr_headline": _build_metr_headline(sources_index),
         "table_rows": sample_records,
-        "agent_economics": _build_agent_economics(unified_rows),
+        "agent_economics": economics.result(),
         "meta": {
             "domains": sorted(domain_by_name.keys()),
             "rows": len(sample_records),
         },
     }
 
-    write_json(SITE_DIR / "data.json", payload)
-    print("Export finished: site/data.json updated")
+    if publish:
+        manifest = write_site_data(quantize_floats(payload), compact=True)
+    else:
+        manifest = write_site_data(payload)
+    print(f"Export finished: site/data.json updated ({len(manifest['shards']['curves']) + 2} shards)")
+    if publish:
+        publish_site()
+    return payload
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Write the site data")
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="write compact, quantized JSON and build build/site with precompressed, hashed assets",
+    )
+    parser.add_argument(
+        "--sample-size",
+        type=int,
+        default=SAMPLE_ROWS,
+        help="rows in the explorer table sample",
+    )
+    parser.add_argument(
+        "--sample-strata",
+        nargs="+",
+        default=list(SAMPLE_STRATA),
+        help="unified columns whose combinations are sampled evenly",
+    )
+    args = parser.parse_args()
+    main(publish=args.publish, sample_size=args.sample_size, sample_strata=args.sample_strata)
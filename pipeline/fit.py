@@ -1,24 +1,31 @@
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import math
+import re
+import zlib
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from statistics import median
+from pathlib import Path
 from typing import Any
 
 import numpy as np
+import pandas as pd
+import yaml
 
-from pipeline.common import PROCESSED_DIR, SNAPSHOTS_DIR, ensure_dirs, write_json
-
-
-def load_unified_records() -> list[dict[str, Any]]:
-    path = PROCESSED_DIR / "unified_records.jsonl"
-    records = []
-    for line in path.read_text().splitlines():
-        if line.strip():
-            records.append(json.loads(line))
-    return records
+from pipeline.common import (
+    PROCESSED_DIR,
+    SOURCES_DIR,
+    ensure_dirs,
+    load_unified_frame,
+    read_json,
+    write_json,
+)
+from pipeline.history import HistoryIndex
+from pipeline.snapshots import SnapshotStore
 
 
 def _safe_log2(x: float) -> float:
@@ -78,6 +85,54 @@ def estimate_horizon(points: list[dict[str, Any]]) -> tuple[float, float, list[d
     return horizon, slope, curve
 
 
+def estimate_horizon_arrays(
+    human_minutes: np.ndarray,
+    score_binarized: np.ndarray,
+) -> tuple[float, float, list[dict[str, float]]]:
+    """NumPy equivalent of ``estimate_horizon`` for column arrays.
+
+    Bins with ``np.bincount`` over rounded log2 minutes, smooths with a running
+    minimum and solves the 50% crossing directly instead of scanning bin pairs.
+    """
+    minutes = np.asarray(human_minutes, dtype=float)
+    keep = minutes > 0
+    if not keep.any():
+        return 0.0, 0.0, []
+
+    bins = np.rint(np.log2(np.maximum(minutes[keep], 1e-6))).astype(np.int64)
+    lowest = bins.min()
+    counts = np.bincount(bins - lowest)
+    totals = np.bincount(bins - lowest, weights=np.asarray(score_binarized, dtype=float)[keep])
+    occupied = np.flatnonzero(counts)
+    x = (occupied + lowest).astype(float)
+    success = totals[occupied] / counts[occupied]
+    smoothed = np.minimum.accumulate(np.minimum(success, 1.0))
+    bin_minutes = np.ldexp(1.0, occupied + lowest)
+
+    below = np.flatnonzero(smoothed < 0.5)
+    if below.size == 0:
+        horizon = float(bin_minutes[-1])
+    elif below[0] == 0:
+        horizon = float(bin_minutes[0])
+    else:
+        # Smoothed success is non-increasing, so the first bin under 50% marks the crossing.
+        i = below[0] - 1
+        span = max(smoothed[i] - smoothed[i + 1], 1e-6)
+        log2_h = x[i] + (smoothed[i] - 0.5) / span * (x[i + 1] - x[i])
+        horizon = float(2 ** float(log2_h))
+
+    slope = 0.0
+    if x.size >= 2:
+        dx = x - x.mean()
+        slope = float(np.dot(dx, success - success.mean()) / np.dot(dx, dx))
+
+    curve = [
+        {"log2_minutes": a, "minutes": m, "success": s, "success_smoothed": sm}
+        for a, m, s, sm in zip(x.tolist(), bin_minutes.tolist(), success.tolist(), smoothed.tolist())
+    ]
+    return horizon, slope, curve
+
+
 def compute_doubling_months(model_points: list[dict[str, Any]]) -> float | None:
     rows = [r for r in model_points if r.get("release_date")]
     if len(rows) < 2:
@@ -107,71 +162,793 @@ def compute_doubling_months(model_points: list[dict[str, Any]]) -> float | None:
     return float(1.0 / slope)
 
 
-def main() -> None:
-    ensure_dirs()
-    records = load_unified_records()
+FIT_COLUMNS = (
+    "benchmark",
+    "domain",
+    "subdomain",
+    "model",
+    "release_date",
+    "human_minutes",
+    "score_binarized",
+)
+FIT_METHODS = ("binned", "logistic")
 
-    grouped_domain: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    grouped_model_domain: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+# L2 penalty on (alpha, beta); keeps perfectly separated groups (all successes, or a
+# clean cut between short and long tasks) finite instead of diverging.
+LOGISTIC_RIDGE = 0.1
+LOGISTIC_MAX_ITER = 50
+LOGISTIC_TOL = 1e-8
+LOGIT_P80 = math.log(4.0)
 
-    for row in records:
-        grouped_domain[row["domain"]].append(row)
-        grouped_model_domain[(row["model"], row["domain"])].append(row)
+BOOTSTRAP_REPLICATES = 1000
+# Replicates per pool job. Fixed, not derived from the worker count, so every
+# (domain, chunk) draws from the same seed however the jobs are scheduled.
+BOOTSTRAP_CHUNK = 100
+BOOTSTRAP_SEED = 20250301
+BOOTSTRAP_QUANTILES = (0.1, 0.9)
+
+# Bump when a change to the fitting code alters results, to invalidate the fit cache.
+FIT_VERSION = 1
+FIT_CACHE_PATH = PROCESSED_DIR / "fit_cache.json"
+
+RELEASE_DATES_YAML = SOURCES_DIR / "metr_release_dates.yaml"
+MISSING_DAY = np.iinfo(np.int64).min
+
+
+def fit_binned_curves(
+    counts: np.ndarray,
+    totals: np.ndarray,
+    lowest: int,
+    with_curves: bool = True,
+) -> tuple[np.ndarray, np.ndarray, list[list[dict[str, float]]]]:
+    """Row-wise ``estimate_horizon_arrays`` over a (groups x log2-bins) count matrix.
+
+    ``counts``/``totals`` hold run counts and successes per bin, with column 0 at
+    log2 bin ``lowest``. Empty bins are skipped exactly as if they did not exist.
+    ``with_curves=False`` skips building the per-group curve dicts.
+    """
+    n_groups, n_bins = counts.shape
+    occupied = counts > 0
+    columns = np.arange(n_bins)
+    x = (columns + lowest).astype(float)
+    bin_minutes = np.ldexp(1.0, columns + lowest)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        success = np.where(occupied, totals / counts, np.inf)
+    smoothed = np.minimum.accumulate(np.minimum(success, 1.0), axis=1)
+
+    has_points = occupied.any(axis=1)
+    first = occupied.argmax(axis=1)
+    last = n_bins - 1 - occupied[:, ::-1].argmax(axis=1)
+    below = occupied & (smoothed < 0.5)
+    crosses = below.any(axis=1)
+    cross = below.argmax(axis=1)
+    # Index of the nearest occupied bin at or before each column.
+    previous = np.maximum.accumulate(np.where(occupied, columns, -1), axis=1)
+    before = previous[np.arange(n_groups), np.maximum(cross - 1, 0)]
+
+    horizons = np.where(crosses, bin_minutes[first], bin_minutes[last])
+    interior = crosses & (cross != first)
+    for g in np.flatnonzero(interior):
+        i, j = before[g], cross[g]
+        span = max(smoothed[g, i] - smoothed[g, j], 1e-6)
+        log2_h = x[i] + (smoothed[g, i] - 0.5) / span * (x[j] - x[i])
+        horizons[g] = 2 ** float(log2_h)
+    horizons = np.where(has_points, horizons, 0.0)
+
+    n = occupied.sum(axis=1)
+    weights = occupied.astype(float)
+    values = np.where(occupied, success, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = (weights * x).sum(axis=1) / n
+        mean_y = values.sum(axis=1) / n
+        dx = (x - mean_x[:, None]) * weights
+        slopes = (dx * (values - mean_y[:, None])).sum(axis=1) / (dx * dx).sum(axis=1)
+    slopes = np.where(n >= 2, slopes, 0.0)
 
-    model_domain = []
     curves = []
-    for (model, domain), points in grouped_model_domain.items():
-        horizon, beta, curve = estimate_horizon(points)
-        release_dates = sorted({p.get("release_date", "") for p in points if p.get("release_date")})
-        model_domain.append(
-            {
-                "model": model,
-                "domain": domain,
-                "release_date": release_dates[-1] if release_dates else "",
-                "horizon_minutes": round(horizon, 4),
-                "beta_proxy": round(beta, 6),
-                "n_points": len(points),
-            }
+    for g in range(n_groups if with_curves else 0):
+        cols = np.flatnonzero(occupied[g])
+        curves.append(
+            [
+                {"log2_minutes": a, "minutes": m, "success": s, "success_smoothed": sm}
+                for a, m, s, sm in zip(
+                    x[cols].tolist(),
+                    bin_minutes[cols].tolist(),
+                    success[g, cols].tolist(),
+                    smoothed[g, cols].tolist(),
+                )
+            ]
         )
-        curves.append({"model": model, "domain": domain, "points": curve})
+    return horizons, slopes, curves
+
+
+def fit_logistic_groups(
+    log2_minutes: np.ndarray,
+    success: np.ndarray,
+    group_ids: np.ndarray,
+    n_groups: int,
+    trials: np.ndarray | None = None,
+    ridge: float = LOGISTIC_RIDGE,
+    max_iter: int = LOGISTIC_MAX_ITER,
+    tol: float = LOGISTIC_TOL,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fit P(success) = sigmoid(alpha + beta * log2 minutes) for every group at once.
+
+    Runs Newton/IRLS on the stacked per-run arrays: each iteration accumulates every
+    group's gradient and 2x2 Hessian with ``np.bincount`` and solves them in closed
+    form. Groups stop updating once their step falls below ``tol``. With ``trials``,
+    each row is a binomial count: ``success`` successes out of ``trials`` runs.
+    """
+    x = np.asarray(log2_minutes, dtype=float)
+    y = np.asarray(success, dtype=float)
+    n = np.ones_like(x) if trials is None else np.asarray(trials, dtype=float)
+    alpha = np.zeros(n_groups)
+    beta = np.zeros(n_groups)
+    active = np.ones(n_groups, dtype=bool)
+    for _ in range(max_iter):
+        eta = alpha[group_ids] + beta[group_ids] * x
+        p = 0.5 * (1.0 + np.tanh(0.5 * eta))
+        w = n * p * (1.0 - p)
+        r = y - n * p
+        g0 = np.bincount(group_ids, weights=r, minlength=n_groups) - ridge * alpha
+        g1 = np.bincount(group_ids, weights=r * x, minlength=n_groups) - ridge * beta
+        h00 = np.bincount(group_ids, weights=w, minlength=n_groups) + ridge
+        h01 = np.bincount(group_ids, weights=w * x, minlength=n_groups)
+        h11 = np.bincount(group_ids, weights=w * x * x, minlength=n_groups) + ridge
+        det = h00 * h11 - h01 * h01
+        step_alpha = np.where(active, (h11 * g0 - h01 * g1) / det, 0.0)
+        step_beta = np.where(active, (h00 * g1 - h01 * g0) / det, 0.0)
+        alpha += step_alpha
+        beta += step_beta
+        active &= np.maximum(np.abs(step_alpha), np.abs(step_beta)) > tol
+        if not active.any():
+            break
+    return alpha, beta
+
+
+def logistic_horizons(
+    alpha: np.ndarray,
+    beta: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    logit: float = 0.0,
+) -> np.ndarray:
+    """Minutes at which the fitted curve crosses ``sigmoid(logit)`` (0 = p50).
+
+    Crossings are censored to each group's observed log2 range ``[low, high]``, the
+    same convention the binned estimate uses; a non-declining fit is placed at
+    ``high`` if it stays above the threshold there and at ``low`` otherwise.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing = (logit - alpha) / beta
+        above_at_high = alpha + beta * high >= logit
+    crossing = np.where(beta < 0, crossing, np.where(above_at_high, high, low))
+    return np.exp2(np.clip(crossing, low, high))
+
+
+def _binomial_counts(
+    ids: np.ndarray,
+    x_codes: np.ndarray,
+    n_x: int,
+    success: np.ndarray,
+    trials: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Sum successes and trials per distinct (id, x code) pair."""
+    pairs, uniques = pd.factorize(ids.astype(np.int64) * n_x + x_codes)
+    wins = np.bincount(pairs, weights=success, minlength=len(uniques))
+    runs = np.bincount(pairs, weights=trials, minlength=len(uniques))
+    return uniques // n_x, uniques % n_x, wins, runs
+
+
+def fit_all_groups(
+    records: pd.DataFrame,
+    method: str = "binned",
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Fit every (model, domain) group and every domain from one set of bin counts.
+
+    Each record is binned once; group curves come from a single ``np.bincount`` over
+    (group, log2 bin) and domain curves by summing their groups' rows. Returns the
+    model/domain rows, their curves, and per-domain statistics, in first-seen order.
+
+    With ``method="logistic"`` the horizons come from ``fit_logistic_groups`` on the
+    unbinned runs instead, and rows gain p80 horizons and the fitted parameters.
+    """
+    if method not in FIT_METHODS:
+        raise ValueError(f"Unknown fit method {method!r}; expected one of {FIT_METHODS}")
+    group_ids, keys = pd.MultiIndex.from_frame(records[["model", "domain"]]).factorize()
+    keys = [(str(model), str(domain)) for model, domain in keys]
+    domain_ids, domain_names = pd.factorize(pd.Index([domain for _, domain in keys]))
+    n_groups, n_domains = len(keys), len(domain_names)
+
+    minutes = records["human_minutes"].to_numpy(dtype=float)
+    scores = records["score_binarized"].to_numpy(dtype=float)
+    keep = minutes > 0
+    bins = np.rint(np.log2(np.maximum(minutes[keep], 1e-6))).astype(np.int64)
+    lowest = int(bins.min()) if bins.size else 0
+    n_bins = int(bins.max()) - lowest + 1 if bins.size else 1
+    flat = group_ids[keep] * n_bins + (bins - lowest)
+    size = n_groups * n_bins
+    counts = np.bincount(flat, minlength=size).reshape(n_groups, n_bins).astype(float)
+    totals = np.bincount(flat, weights=scores[keep], minlength=size).reshape(n_groups, n_bins)
+
+    domain_counts = np.zeros((n_domains, n_bins))
+    domain_totals = np.zeros((n_domains, n_bins))
+    np.add.at(domain_counts, domain_ids, counts)
+    np.add.at(domain_totals, domain_ids, totals)
+
+    horizons, slopes, group_curves = fit_binned_curves(counts, totals, lowest)
+    domain_horizons, _, _ = fit_binned_curves(domain_counts, domain_totals, lowest)
+    record_domains = domain_ids[group_ids]
+
+    if method == "logistic":
+        # Runs of one task share its length, so collapse each group to binomial
+        # counts per distinct duration before solving.
+        x_codes, x_values = pd.factorize(minutes[keep])
+        n_x = max(len(x_values), 1)
+        log2_values = np.log2(x_values)
+        ids, codes, wins, trials = _binomial_counts(group_ids[keep], x_codes, n_x, scores[keep])
+        logistic = {}
+        for name, n in (("group", n_groups), ("domain", n_domains)):
+            if name == "domain":
+                ids, codes, wins, trials = _binomial_counts(domain_ids[ids], codes, n_x, wins, trials)
+            x = log2_values[codes]
+            low = np.full(n, np.inf)
+            high = np.full(n, -np.inf)
+            np.minimum.at(low, ids, x)
+            np.maximum.at(high, ids, x)
+            alpha, beta = fit_logistic_groups(x, wins, ids, n, trials=trials)
+            fitted = np.isfinite(low)
+            p50 = np.where(fitted, logistic_horizons(alpha, beta, low, high), 0.0)
+            p80 = np.where(fitted, logistic_horizons(alpha, beta, low, high, LOGIT_P80), 0.0)
+            logistic[name] = (alpha, beta, p50, p80)
+        horizons = logistic["group"][2]
+        domain_horizons = logistic["domain"][2]
+
+    sizes = np.bincount(group_ids, minlength=n_groups)
+    dates = records["release_date"].astype(str).to_numpy()
+    dated = dates != ""
+    latest = pd.Series(dates[dated]).groupby(group_ids[dated]).max().to_dict()
+
+    model_domain = []
+    curves = []
+    for g, (model, domain) in enumerate(keys):
+        row = {
+            "model": model,
+            "domain": domain,
+            "release_date": latest.get(g, ""),
+            "horizon_minutes": round(float(horizons[g]), 4),
+            "beta_proxy": round(float(slopes[g]), 6),
+            "n_points": int(sizes[g]),
+        }
+        if method == "logistic":
+            alpha, beta, _, p80 = logistic["group"]
+            row["horizon_p80_minutes"] = round(float(p80[g]), 4)
+            row["logistic_alpha"] = round(float(alpha[g]), 6)
+            row["logistic_beta"] = round(float(beta[g]), 6)
+        model_domain.append(row)
+        curves.append({"model": model, "domain": domain, "points": group_curves[g]})
+
+    domain_points = np.bincount(record_domains, minlength=n_domains)
+    domain_medians = pd.Series(minutes).groupby(record_domains).median()
+    domain_stats = {
+        str(domain): {
+            "horizon": float(domain_horizons[d]),
+            "points": int(domain_points[d]),
+            "median_minutes": float(domain_medians[d]),
+        }
+        for d, domain in enumerate(domain_names)
+    }
+    if method == "logistic":
+        for d, stats in enumerate(domain_stats.values()):
+            stats["horizon_p80"] = float(logistic["domain"][3][d])
+    return model_domain, curves, domain_stats
+
+
+def domain_task_table(records: pd.DataFrame) -> dict[str, dict[str, np.ndarray]]:
+    """Successes and runs per task, grouped by domain.
+
+    Unified records carry no task id, so a task is identified by its benchmark,
+    task family (``subdomain``) and human baseline minutes. Tasks are sorted, so
+    the table does not depend on record order. Runs without a duration are dropped,
+    as the fits ignore them too.
+    """
+    timed = records[records["human_minutes"] > 0]
+    tasks = timed.groupby(
+        ["domain", "benchmark", "subdomain", "human_minutes"], observed=True, sort=True
+    )["score_binarized"].agg(["sum", "count"])
+    domains = tasks.index.get_level_values("domain").astype(str)
+    log2_minutes = np.log2(tasks.index.get_level_values("human_minutes").to_numpy(dtype=float))
+    table = {}
+    for domain, rows in pd.Series(np.arange(len(tasks))).groupby(domains, sort=False):
+        rows = rows.to_numpy()
+        table[str(domain)] = {
+            "log2_minutes": log2_minutes[rows],
+            "wins": tasks["sum"].to_numpy(dtype=float)[rows],
+            "runs": tasks["count"].to_numpy(dtype=float)[rows],
+        }
+    return table
+
+
+def _bootstrap_chunk(
+    job: tuple[dict[str, np.ndarray], str, list[int], int],
+) -> np.ndarray:
+    """Domain horizons for ``size`` replicates that resample the domain's tasks."""
+    tasks, method, seed_key, size = job
+    x = tasks["log2_minutes"]
+    n_tasks = x.size
+    rng = np.random.default_rng(seed_key)
+    draws = rng.integers(0, n_tasks, size=(size, n_tasks))
+    replicate = np.repeat(np.arange(size), n_tasks)
+    wins = tasks["wins"][draws].ravel()
+    runs = tasks["runs"][draws].ravel()
+
+    if method == "logistic":
+        sampled = x[draws]
+        alpha, beta = fit_logistic_groups(sampled.ravel(), wins, replicate, size, trials=runs)
+        low, high = sampled.min(axis=1), sampled.max(axis=1)
+        return logistic_horizons(alpha, beta, low, high)
+
+    bins = np.rint(x).astype(np.int64)
+    lowest = int(bins.min())
+    n_bins = int(bins.max()) - lowest + 1
+    flat = replicate * n_bins + (bins - lowest)[draws].ravel()
+    counts = np.bincount(flat, weights=runs, minlength=size * n_bins).reshape(size, n_bins)
+    totals = np.bincount(flat, weights=wins, minlength=size * n_bins).reshape(size, n_bins)
+    horizons, _, _ = fit_binned_curves(counts, totals, lowest, with_curves=False)
+    return horizons
+
+
+def bootstrap_domain_horizons(
+    records: pd.DataFrame,
+    replicates: int = BOOTSTRAP_REPLICATES,
+    method: str = "binned",
+    workers: int = 1,
+    seed: int = BOOTSTRAP_SEED,
+) -> dict[str, tuple[float, float]]:
+    """``BOOTSTRAP_QUANTILES`` of each domain horizon under task resampling.
+
+    Each replicate draws the domain's tasks with replacement and refits the domain
+    horizon with ``method``. Replicates run in fixed-size chunks, each seeded from
+    ``(seed, crc32(domain), chunk)``, so results are identical for any ``workers``.
+    """
+    jobs = []
+    owners = []
+    for domain, tasks in domain_task_table(records).items():
+        domain_key = zlib.crc32(domain.encode())
+        for chunk, start in enumerate(range(0, replicates, BOOTSTRAP_CHUNK)):
+            size = min(BOOTSTRAP_CHUNK, replicates - start)
+            jobs.append((tasks, method, [seed, domain_key, chunk], size))
+            owners.append(domain)
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_bootstrap_chunk, jobs))
+    else:
+        results = [_bootstrap_chunk(job) for job in jobs]
+
+    samples: dict[str, list[np.ndarray]] = defaultdict(list)
+    for domain, horizons in zip(owners, results):
+        samples[domain].append(horizons)
+    intervals = {}
+    for domain, chunks in samples.items():
+        low, high = np.quantile(np.concatenate(chunks), BOOTSTRAP_QUANTILES)
+        intervals[domain] = (float(low), float(high))
+    return intervals
+
+
+class FitIndex:
+    """Lookups over the model/domain rows, built in one pass.
+
+    ``by_domain``/``by_model`` map a name to its rows in input order, and
+    ``latest_release`` holds each model's latest non-empty release date.
+    """
 
+    def __init__(self, model_domain: list[dict[str, Any]]) -> None:
+        self.by_domain: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.by_model: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.latest_release: dict[str, str] = {}
+        for row in model_domain:
+            self.by_domain[row["domain"]].append(row)
+            self.by_model[row["model"]].append(row)
+            date = row.get("release_date") or ""
+            if date > self.latest_release.get(row["model"], ""):
+                self.latest_release[row["model"]] = date
+
+    def domain_rows(self, domain: str) -> list[dict[str, Any]]:
+        return self.by_domain.get(domain, [])
+
+    def model_rows(self, model: str) -> list[dict[str, Any]]:
+        return self.by_model.get(model, [])
+
+
+def load_release_date_yaml(path: Path = RELEASE_DATES_YAML) -> dict[str, str]:
+    """METR's ``release_dates.yaml``: a ``date:`` mapping of model name to ISO date."""
+    if not path.exists():
+        return {}
+    data = yaml.safe_load(path.read_text())
+    if isinstance(data, dict) and isinstance(data.get("date"), dict):
+        data = data["date"]
+    if not isinstance(data, dict):
+        return {}
+    return {str(k): str(v) for k, v in data.items()}
+
+
+def parse_release_days(values: list[str]) -> np.ndarray:
+    """Days since 1970-01-01 for ISO dates/timestamps; ``MISSING_DAY`` where unparseable."""
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce", format="ISO8601", utc=True)
+    days = parsed.dt.floor("D").dt.tz_localize(None).to_numpy("datetime64[D]")
+    return np.where(np.isnat(days), MISSING_DAY, days.astype(np.int64))
+
+
+class ReleaseDateTable:
+    """Model name -> release day (int epoch days), parsed once for the whole fit.
+
+    Dates from run metadata win; otherwise the METR release-date YAML is looked up
+    by exact and case-folded name, then with trailing agent tags such as
+    `` (Inspect)`` removed one at a time.
+    """
+
+    def __init__(self, models: list[str], days: np.ndarray) -> None:
+        self.models = list(models)
+        self.days = np.asarray(days, dtype=np.int64)
+        self._position = {model: i for i, model in enumerate(self.models)}
+
+    @classmethod
+    def build(cls, run_dates: dict[str, str], yaml_dates: dict[str, str]) -> ReleaseDateTable:
+        folded = {name.lower(): date for name, date in yaml_dates.items()}
+        models = sorted(run_dates)
+        resolved = []
+        for model in models:
+            date = run_dates[model]
+            name = model
+            while not date and name:
+                date = yaml_dates.get(name) or folded.get(name.lower(), "")
+                stripped = re.sub(r"\s*\([^()]*\)$", "", name)
+                name = stripped if stripped != name else ""
+            resolved.append(date)
+        return cls(models, parse_release_days(resolved))
+
+    def lookup(self, models: list[str]) -> np.ndarray:
+        positions = [self._position.get(model, -1) for model in models]
+        return np.array([self.days[i] if i >= 0 else MISSING_DAY for i in positions], dtype=np.int64)
+
+
+def _wls_slopes(
+    ids: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    weights: np.ndarray,
+    n_groups: int,
+) -> np.ndarray:
+    """Weighted least-squares slope of ``y`` on ``x`` per group; NaN if undetermined."""
+    sw = np.bincount(ids, weights=weights, minlength=n_groups)
+    sx = np.bincount(ids, weights=weights * x, minlength=n_groups)
+    sy = np.bincount(ids, weights=weights * y, minlength=n_groups)
+    sxx = np.bincount(ids, weights=weights * x * x, minlength=n_groups)
+    sxy = np.bincount(ids, weights=weights * x * y, minlength=n_groups)
+    denominator = sw * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = (sw * sxy - sx * sy) / denominator
+    points = np.bincount(ids, minlength=n_groups)
+    # Guard against rounding noise when every x is the same.
+    degenerate = (points < 2) | (denominator <= 1e-12 * np.maximum(sw * sxx, 1e-300))
+    return np.where(degenerate, np.nan, slopes)
+
+
+def domain_doubling_months(
+    index: FitIndex,
+    releases: ReleaseDateTable,
+    weights: str | None = None,
+    replicates: int = 0,
+    seed: int = BOOTSTRAP_SEED,
+) -> dict[str, dict[str, float | None]]:
+    """Doubling time of each domain's horizon trend, solved for all domains at once.
+
+    Regresses log2 horizon on release month over every dated model in each domain
+    with one closed-form weighted least-squares pass (``weights="n_points"``
+    weights models by their run count; default is unweighted, matching
+    ``compute_doubling_months``). With ``replicates`` the models of each domain
+    are resampled to give ``BOOTSTRAP_QUANTILES`` of the doubling time.
+    """
+    domains = list(index.by_domain)
+    rows = [(d, row) for d, domain in enumerate(domains) for row in index.by_domain[domain]]
+    ids = np.array([d for d, _ in rows], dtype=np.int64)
+    days = releases.lookup([row["model"] for _, row in rows])
+    dated = days != MISSING_DAY
+    ids = ids[dated]
+    x = days[dated] / 30.4375
+    y = np.log2(np.maximum([float(row["horizon_minutes"]) for _, row in rows], 1e-6))[dated]
+    w = (
+        np.array([float(row.get("n_points", 1)) for _, row in rows])[dated]
+        if weights == "n_points"
+        else np.ones(ids.size)
+    )
+    slopes = _wls_slopes(ids, x, y, w, len(domains))
+
+    def months(slope: float) -> float | None:
+        return float(1.0 / slope) if slope > 0 else None
+
+    result: dict[str, dict[str, float | None]] = {
+        domain: {"doubling_months": months(slopes[d])} for d, domain in enumerate(domains)
+    }
+    if replicates <= 0:
+        return result
+
+    for d, domain in enumerate(domains):
+        members = np.flatnonzero(ids == d)
+        if members.size < 2:
+            continue
+        rng = np.random.default_rng([seed, zlib.crc32(domain.encode())])
+        draws = members[rng.integers(0, members.size, size=(replicates, members.size))]
+        replicate = np.repeat(np.arange(replicates), members.size)
+        sampled = _wls_slopes(replicate, x[draws].ravel(), y[draws].ravel(), w[draws].ravel(), replicates)
+        sampled = sampled[~np.isnan(sampled)]
+        if sampled.size == 0:
+            continue
+        # Doubling time falls as the slope rises, so the slope quantiles swap ends.
+        slow, fast = np.quantile(sampled, BOOTSTRAP_QUANTILES)
+        result[domain]["ci_low_months"] = months(fast)
+        result[domain]["ci_high_months"] = months(slow)
+    return result
+
+
+def summarize_domains(
+    domain_stats: dict[str, dict[str, Any]],
+    index: FitIndex,
+    intervals: dict[str, tuple[float, float]] | None = None,
+    doubling: dict[str, dict[str, float | None]] | None = None,
+) -> list[dict[str, Any]]:
+    """One ``domain_horizons`` row per domain, sorted by domain."""
+    intervals = intervals or {}
+    doubling = doubling or {}
     domain_horizons = []
-    for domain, points in grouped_domain.items():
-        h, _, _ = estimate_horizon(points)
-        domain_models = [row for row in model_domain if row["domain"] == domain]
-        horizons = [float(m["horizon_minutes"]) for m in domain_models if m["horizon_minutes"] > 0]
-        low = float(np.quantile(horizons, 0.1)) if horizons else 0.0
-        high = float(np.quantile(horizons, 0.9)) if horizons else 0.0
-        doubling = compute_doubling_months(domain_models)
-        domain_horizons.append(
-            {
-                "domain": domain,
-                "horizon_p50_minutes": round(float(h), 4),
-                "horizon_ci_low_minutes": round(low, 4),
-                "horizon_ci_high_minutes": round(high, 4),
-                "doubling_time_months": round(doubling, 4) if doubling else None,
-                "models": len({m["model"] for m in domain_models}),
-                "points": len(points),
-                "median_record_minutes": round(float(median([float(p["human_minutes"]) for p in points])), 4),
-            }
+    for domain, stats in domain_stats.items():
+        domain_models = index.domain_rows(domain)
+        if domain in intervals:
+            low, high = intervals[domain]
+        else:
+            # No bootstrap (or no timed tasks): fall back to the spread across models.
+            horizons = [float(m["horizon_minutes"]) for m in domain_models if m["horizon_minutes"] > 0]
+            low = float(np.quantile(horizons, 0.1)) if horizons else 0.0
+            high = float(np.quantile(horizons, 0.9)) if horizons else 0.0
+        trend = doubling.get(domain, {})
+        months = trend.get("doubling_months")
+        row = {
+            "domain": domain,
+            "horizon_p50_minutes": round(stats["horizon"], 4),
+            "horizon_ci_low_minutes": round(low, 4),
+            "horizon_ci_high_minutes": round(high, 4),
+            "doubling_time_months": round(months, 4) if months else None,
+            # Rows are unique per (model, domain), so this counts distinct models.
+            "models": len(domain_models),
+            "points": stats["points"],
+            "median_record_minutes": round(stats["median_minutes"], 4),
+        }
+        if "horizon_p80" in stats:
+            row["horizon_p80_minutes"] = round(stats["horizon_p80"], 4)
+        for key in ("ci_low_months", "ci_high_months"):
+            if key in trend:
+                value = trend[key]
+                row[f"doubling_time_{key}"] = round(value, 4) if value else None
+        domain_horizons.append(row)
+    return sorted(domain_horizons, key=lambda x: x["domain"])
+
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _group_key(model: str, domain: str) -> str:
+    return json.dumps([model, domain])
+
+
+def group_fingerprints(records: pd.DataFrame) -> tuple[np.ndarray, list[tuple[str, str]], list[str]]:
+    """Content hash of every (model, domain) group's records, independent of row order.
+
+    Returns the per-record group ids, the group keys in first-seen order (as in
+    ``fit_all_groups``) and one SHA-256 hex digest per group.
+    """
+    group_ids, keys = pd.MultiIndex.from_frame(records[["model", "domain"]]).factorize()
+    keys = [(str(model), str(domain)) for model, domain in keys]
+    columns = [column for column in FIT_COLUMNS if column in records]
+    row_hash = pd.util.hash_pandas_object(records[columns], index=False).to_numpy()
+    order = np.lexsort((row_hash, group_ids))
+    bounds = np.searchsorted(group_ids[order], np.arange(len(keys) + 1))
+    row_hash = row_hash[order]
+    fingerprints = [
+        hashlib.sha256(row_hash[bounds[g] : bounds[g + 1]].tobytes()).hexdigest() for g in range(len(keys))
+    ]
+    return group_ids, keys, fingerprints
+
+
+def fit_params(method: str, replicates: int) -> dict[str, Any]:
+    """Everything besides the records that determines cached group and domain fits."""
+    return {
+        "version": FIT_VERSION,
+        "method": method,
+        "replicates": replicates,
+        "bootstrap": [BOOTSTRAP_SEED, BOOTSTRAP_CHUNK, list(BOOTSTRAP_QUANTILES)],
+        "logistic": [LOGISTIC_RIDGE, LOGISTIC_MAX_ITER, LOGISTIC_TOL],
+    }
+
+
+def fit_incremental(
+    records: pd.DataFrame,
+    cache: dict[str, Any],
+    method: str = "binned",
+    replicates: int = BOOTSTRAP_REPLICATES,
+    workers: int = 1,
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, int]]:
+    """Fit groups and domains, reusing ``cache`` entries whose inputs are unchanged.
+
+    Each (model, domain) group is cached under its record fingerprint; each domain
+    under the fingerprints of its groups, since its horizon and bootstrap interval
+    pool every group. Only stale groups and domains are refit. Returns the results
+    (``model_domain``, ``curves``, ``domain_stats``, ``intervals``), the new cache
+    and how many groups/domains were refit.
+    """
+    params = _digest(fit_params(method, replicates))
+    if cache.get("params") != params:
+        cache = {}
+    cached_groups = cache.get("groups", {})
+    cached_domains = cache.get("domains", {})
+
+    group_ids, keys, fingerprints = group_fingerprints(records)
+    domain_members: dict[str, list[str]] = defaultdict(list)
+    for (_, domain), fingerprint in zip(keys, fingerprints):
+        domain_members[domain].append(fingerprint)
+    domain_fingerprints = {domain: _digest(sorted(fps)) for domain, fps in domain_members.items()}
+
+    stale_groups = [
+        g
+        for g, ((model, domain), fingerprint) in enumerate(zip(keys, fingerprints))
+        if cached_groups.get(_group_key(model, domain), {}).get("fingerprint") != fingerprint
+    ]
+    stale_domains = [
+        domain
+        for domain, fingerprint in domain_fingerprints.items()
+        if cached_domains.get(domain, {}).get("fingerprint") != fingerprint
+    ]
+
+    groups = {}
+    if stale_groups:
+        subset = records[np.isin(group_ids, stale_groups)]
+        rows, curves, _ = fit_all_groups(subset, method=method)
+        for row, curve in zip(rows, curves):
+            groups[_group_key(row["model"], row["domain"])] = {"row": row, "curve": curve["points"]}
+
+    domains = {}
+    if stale_domains:
+        subset = records[records["domain"].astype(str).isin(stale_domains)]
+        # A single pseudo-model turns each domain into one group with the domain's fit.
+        _, _, stats = fit_all_groups(subset.assign(model=""), method=method)
+        intervals = (
+            bootstrap_domain_horizons(subset, replicates, method=method, workers=workers)
+            if replicates > 0
+            else {}
         )
+        for domain in stale_domains:
+            interval = intervals.get(domain)
+            domains[domain] = {"stats": stats[domain], "interval": list(interval) if interval else None}
+
+    new_cache: dict[str, Any] = {"params": params, "groups": {}, "domains": {}}
+    model_domain, curves = [], []
+    for (model, domain), fingerprint in zip(keys, fingerprints):
+        key = _group_key(model, domain)
+        entry = groups.get(key) or cached_groups[key]
+        new_cache["groups"][key] = {"fingerprint": fingerprint, "row": entry["row"], "curve": entry["curve"]}
+        model_domain.append(entry["row"])
+        curves.append({"model": model, "domain": domain, "points": entry["curve"]})
+
+    domain_stats, intervals = {}, {}
+    for domain, fingerprint in domain_fingerprints.items():
+        entry = domains.get(domain) or cached_domains[domain]
+        new_cache["domains"][domain] = {"fingerprint": fingerprint, **entry}
+        domain_stats[domain] = entry["stats"]
+        if entry["interval"]:
+            intervals[domain] = tuple(entry["interval"])
+
+    results = {
+        "model_domain": model_domain,
+        "curves": curves,
+        "domain_stats": domain_stats,
+        "intervals": intervals,
+    }
+    return results, new_cache, {"groups": len(stale_groups), "domains": len(stale_domains)}
+
+
+def main(
+    method: str = "binned",
+    replicates: int = BOOTSTRAP_REPLICATES,
+    workers: int = 1,
+    doubling_replicates: int = 0,
+    incremental: bool = True,
+) -> dict[str, Any]:
+    """Fit every group and domain, write ``fits.json`` and a snapshot, and return it."""
+    ensure_dirs()
+    records = load_unified_frame(FIT_COLUMNS)
+    cache = read_json(FIT_CACHE_PATH) if incremental and FIT_CACHE_PATH.exists() else {}
+    results, new_cache, refit = fit_incremental(records, cache, method, replicates, workers)
+    model_domain, curves = results["model_domain"], results["curves"]
+    domain_stats, intervals = results["domain_stats"], results["intervals"]
+
+    release_yaml = load_release_date_yaml()
+    new_cache["inputs"] = _digest(
+        {
+            "groups": {key: entry["fingerprint"] for key, entry in new_cache["groups"].items()},
+            "release_dates": release_yaml,
+            "doubling_replicates": doubling_replicates,
+            "params": new_cache["params"],
+        }
+    )
+    fits_path = PROCESSED_DIR / "fits.json"
+    if fits_path.exists() and cache.get("inputs") == new_cache["inputs"]:
+        print(f"Fit skipped: {len(model_domain)} model/domain groups unchanged")
+        return read_json(fits_path)
+
+    index = FitIndex(model_domain)
+    releases = ReleaseDateTable.build(index.latest_release, release_yaml)
+    doubling = domain_doubling_months(index, releases, replicates=doubling_replicates)
+    domain_horizons = summarize_domains(domain_stats, index, intervals, doubling)
 
     payload = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
-        "domain_horizons": sorted(domain_horizons, key=lambda x: x["domain"]),
+        "fit_method": method,
+        "bootstrap_replicates": replicates,
+        "domain_horizons": domain_horizons,
         "model_domain": sorted(model_domain, key=lambda x: (x["domain"], x["model"])),
         "curves": curves,
     }
 
-    write_json(PROCESSED_DIR / "fits.json", payload)
-    SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
+    write_json(fits_path, payload)
     stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    write_json(SNAPSHOTS_DIR / f"fits_{stamp}.json", payload)
+    SnapshotStore().save(payload, stamp)
+    HistoryIndex().append(stamp, payload)
+    write_json(FIT_CACHE_PATH, new_cache)
     print(
         f"Fit finished: {len(payload['domain_horizons'])} domains, "
-        f"{len(payload['model_domain'])} model/domain rows"
+        f"{len(payload['model_domain'])} model/domain rows "
+        f"({refit['groups']} groups and {refit['domains']} domains refit)"
     )
+    return payload
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Fit time horizons per domain and model/domain group")
+    parser.add_argument(
+        "--method",
+        choices=FIT_METHODS,
+        default="binned",
+        help="binned 50%% crossing (default) or a logistic fit giving p50 and p80 horizons",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=BOOTSTRAP_REPLICATES,
+        help="task-resampling replicates per domain for horizon intervals (0 = spread across models)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="run bootstrap chunks across this many processes",
+    )
+    parser.add_argument(
+        "--doubling-bootstrap",
+        type=int,
+        default=0,
+        help="model-resampling replicates for doubling-time intervals (0 = none)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore the fit cache and refit every group and domain",
+    )
+    args = parser.parse_args()
+    main(
+        method=args.method,
+        replicates=args.bootstrap,
+        workers=args.workers,
+        doubling_replicates=args.doubling_bootstrap,
+        incremental=not args.full,
+    )
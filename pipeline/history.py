@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from pipeline.common import SNAPSHOTS_DIR
+from pipeline.snapshots import SnapshotStore
+
+HISTORY_DIR = SNAPSHOTS_DIR / "history"
+
+# One row per (snapshot, domain/model, metric), in long form so new metrics need no
+# schema change. Domain-level rows have an empty ``model``.
+HISTORY_SCHEMA = pa.schema(
+    [
+        ("timestamp", pa.string()),
+        ("level", pa.string()),
+        ("domain", pa.string()),
+        ("model", pa.string()),
+        ("metric", pa.string()),
+        ("value", pa.float64()),
+    ]
+)
+KEY_COLUMNS = ("timestamp", "level", "domain", "model", "metric")
+
+# Payload lists that are indexed, and the level their rows are filed under.
+LEVELS = {"domain_horizons": "domain", "model_domain": "model_domain"}
+
+
+def snapshot_rows(stamp: str, payload: dict[str, Any]) -> pd.DataFrame:
+    """Every numeric field of a snapshot's domain and model/domain rows, in long form."""
+    rows = []
+    for key, level in LEVELS.items():
+        for item in payload.get(key, []):
+            domain = str(item.get("domain", ""))
+            model = str(item.get("model", "")) if level == "model_domain" else ""
+            for metric, value in item.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                rows.append((stamp, level, domain, model, metric, float(value)))
+    return pd.DataFrame(rows, columns=HISTORY_SCHEMA.names).astype({"value": float})
+
+
+class HistoryIndex:
+    """Columnar index of snapshot time x domain/model x metric.
+
+    Backed by one small zstd Parquet part file per snapshot (``<stamp>.parquet``) next
+    to the snapshot store, read together as a dataset. ``append`` writes only the new
+    snapshot's part as ``fit.main`` saves it, so its cost does not grow with the
+    history; queries read only the matching row groups and columns, without touching
+    the snapshots themselves.
+    """
+
+    def __init__(self, path: Path = HISTORY_DIR) -> None:
+        self.path = path
+
+    def _part(self, stamp: str) -> Path:
+        return self.path / f"{stamp}.parquet"
+
+    def _read(self, filters: list[tuple[str, str, Any]] | None = None) -> pd.DataFrame:
+        if not self.stamps():
+            return HISTORY_SCHEMA.empty_table().to_pandas()
+        table = pq.read_table(self.path, schema=HISTORY_SCHEMA, filters=filters or None)
+        frame = table.to_pandas()
+        return frame.sort_values(list(KEY_COLUMNS), kind="stable").reset_index(drop=True)
+
+    def _write(self, stamp: str, frame: pd.DataFrame) -> None:
+        frame = frame.sort_values(list(KEY_COLUMNS), kind="stable").reset_index(drop=True)
+        table = pa.Table.from_pandas(frame, schema=HISTORY_SCHEMA, preserve_index=False)
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Dot-prefixed, so a half-written part is never picked up as part of the dataset.
+        tmp = self.path / f".{stamp}.parquet.tmp"
+        pq.write_table(table, tmp, use_dictionary=list(KEY_COLUMNS), compression="zstd")
+        tmp.replace(self._part(stamp))
+
+    def stamps(self) -> list[str]:
+        if not self.path.is_dir():
+            return []
+        return sorted(part.stem for part in self.path.glob("[!.]*.parquet"))
+
+    def append(self, stamp: str, payload: dict[str, Any]) -> int:
+        """Index ``payload`` under ``stamp``, replacing rows of an earlier run with it."""
+        new = snapshot_rows(stamp, payload)
+        self._write(stamp, new)
+        return len(new)
+
+    def sync(self, store: SnapshotStore | None = None) -> list[str]:
+        """Bring the index in line with ``store``'s manifest; returns the stamps added."""
+        store = store or SnapshotStore()
+        wanted = {entry["timestamp"]: entry["hash"] for entry in store.manifest()}
+        indexed = set(self.stamps())
+        for stamp in indexed - set(wanted):
+            self._part(stamp).unlink()
+        missing = sorted(set(wanted) - indexed)
+        for stamp in missing:
+            self._write(stamp, snapshot_rows(stamp, store.load_tree(wanted[stamp])))
+        return missing
+
+    def query(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+        metrics: Sequence[str] | None = None,
+        domains: Sequence[str] | None = None,
+        models: Sequence[str] | None = None,
+        level: str | None = None,
+    ) -> pd.DataFrame:
+        """Rows with ``start <= timestamp <= end`` matching every given filter.
+
+        Timestamps use the snapshot format ``YYYYMMDDTHHMMSSZ``, which sorts as text.
+        """
+        filters: list[tuple[str, str, Any]] = []
+        if start is not None:
+            filters.append(("timestamp", ">=", start))
+        if end is not None:
+            filters.append(("timestamp", "<=", end))
+        for column, values in (("metric", metrics), ("domain", domains), ("model", models)):
+            if values is not None:
+                filters.append((column, "in", list(values)))
+        if level is not None:
+            filters.append(("level", "==", level))
+        return self._read(filters).reset_index(drop=True)
+
+    def series(
+        self,
+        metric: str,
+        domain: str,
+        model: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> pd.Series:
+        """One metric over time for a domain (or a model within it), indexed by UTC time."""
+        level = "model_domain" if model is not None else "domain"
+        rows = self.query(start, end, [metric], [domain], [model or ""], level)
+        index = pd.to_datetime(rows["timestamp"], format="%Y%m%dT%H%M%SZ", utc=True)
+        return pd.Series(
+            rows["value"].to_numpy(), index=pd.DatetimeIndex(index, name="time"), name=metric
+        )
+
+
+def main(
+    command: str,
+    metric: str | None = None,
+    domain: str | None = None,
+    model: str | None = None,
+) -> None:
+    index = HistoryIndex()
+    if command == "sync":
+        added = index.sync()
+        print(f"History index: {len(added)} snapshots added, {len(index.stamps())} indexed")
+        return
+    if not metric or not domain:
+        raise SystemExit("series needs --metric and --domain")
+    print(index.series(metric, domain, model).to_string())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the history of fit snapshots")
+    parser.add_argument("command", choices=("sync", "series"))
+    parser.add_argument("--metric", help="metric name, e.g. horizon_p50_minutes")
+    parser.add_argument("--domain")
+    parser.add_argument("--model", help="model within --domain (default: the domain row)")
+    args = parser.parse_args()
+    main(args.command, metric=args.metric, domain=args.domain, model=args.model)
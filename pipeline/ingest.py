@@ -1,12 +1,27 @@
 from __future__ import annotations
 
+import argparse
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-import re
+from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from pipeline.common import SOURCES_DIR, ensure_dirs, load_registry, write_json
+from pipeline.common import (
+    SOURCES_DIR,
+    USABLE_SOURCE_STATUSES,
+    ensure_dirs,
+    load_registry,
+    read_json,
+    sha256_file,
+    write_json,
+)
 
 EXT_BY_TYPE = {
     "jsonl": "jsonl",
@@ -14,20 +29,134 @@ EXT_BY_TYPE = {
     "markdown": "md",
 }
 
+DEFAULT_WORKERS = 4
+CHUNK_SIZE = 1 << 20
+
+
+def make_session(pool_size: int = DEFAULT_WORKERS) -> requests.Session:
+    """Shared keep-alive session sized so every worker can hold a pooled connection."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _partial_paths(target: Path) -> tuple[Path, Path]:
+    return target.with_name(target.name + ".part"), target.with_name(target.name + ".part.json")
+
+
+def _resume_state(partial: Path, partial_meta: Path, url: str) -> dict[str, Any] | None:
+    """Validators of an interrupted download of ``url``, or None if it cannot be resumed."""
+    if not partial.exists() or not partial_meta.exists() or partial.stat().st_size == 0:
+        return None
+    try:
+        meta = read_json(partial_meta)
+    except ValueError:
+        return None
+    validator = meta.get("etag") or meta.get("last_modified")
+    if meta.get("url") != url or not validator:
+        return None
+    return {"validator": validator, "offset": partial.stat().st_size}
+
+
+def download_file(
+    url: str,
+    target: Path,
+    previous: dict[str, Any] | None = None,
+    session: requests.Session | None = None,
+) -> dict[str, Any]:
+    """Fetch ``url`` into ``target``, revalidating against ``previous`` when given.
+
+    ``previous`` is the manifest entry from the last ingest. Its ETag/Last-Modified
+    are sent as conditional headers; a 304, or a 200 whose body hashes to the same
+    SHA-256, leaves the file untouched and reports ``changed=False``.
+
+    The body is streamed in ``CHUNK_SIZE`` pieces to ``<target>.part`` and hashed on
+    the way; only a complete download is renamed over ``target``. An interrupted
+    download keeps its ``.part`` file and is resumed with a Range request next time.
+    """
+    partial, partial_meta = _partial_paths(target)
+    resume = _resume_state(partial, partial_meta, url)
+
+    headers = {}
+    if previous and target.exists():
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+    if resume:
+        # Byte offsets refer to the decoded body we stored, so ask for it unencoded.
+        headers["Range"] = f"bytes={resume['offset']}-"
+        headers["If-Range"] = resume["validator"]
+        headers["Accept-Encoding"] = "identity"
+
+    http = session or requests
+    with http.get(url, timeout=30, headers=headers, stream=True) as response:
+        if response.status_code == 304:
+            partial.unlink(missing_ok=True)
+            partial_meta.unlink(missing_ok=True)
+            return {
+                "changed": False,
+                "etag": response.headers.get("ETag") or previous.get("etag", ""),
+                "last_modified": response.headers.get("Last-Modified")
+                or previous.get("last_modified", ""),
+                "sha256": previous.get("sha256") or sha256_file(target),
+            }
+        if response.status_code == 416 and resume:
+            # Stale partial (e.g. upstream shrank); start over without it.
+            response.close()
+            partial.unlink(missing_ok=True)
+            partial_meta.unlink(missing_ok=True)
+            return download_file(url, target, previous, session)
+        response.raise_for_status()
+
+        etag = response.headers.get("ETag", "")
+        last_modified = response.headers.get("Last-Modified", "")
+        digest = hashlib.sha256()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if response.status_code == 206 and resume:
+            with partial.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            mode = "ab"
+        else:
+            mode = "wb"
+            write_json(partial_meta, {"url": url, "etag": etag, "last_modified": last_modified})
+
+        with partial.open(mode) as handle:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                handle.write(chunk)
+                digest.update(chunk)
+            written = handle.tell()
 
-def download_file(url: str, target: Path) -> None:
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_bytes(response.content)
+        expected = response.headers.get("Content-Length")
+        if expected and not response.headers.get("Content-Encoding"):
+            received = written - (resume["offset"] if mode == "ab" else 0)
+            if received != int(expected):
+                raise OSError(f"Truncated download of {url}: {received} of {expected} bytes")
 
+    checksum = digest.hexdigest()
+    changed = not (previous and target.exists() and previous.get("sha256") == checksum)
+    if changed:
+        os.replace(partial, target)
+    else:
+        partial.unlink()
+    partial_meta.unlink(missing_ok=True)
+    return {
+        "changed": changed,
+        "etag": etag,
+        "last_modified": last_modified,
+        "sha256": checksum,
+    }
 
-def get_latest_metr_report() -> str:
+
+def get_latest_metr_report(session: requests.Session | None = None) -> str:
     """Find the latest time-horizon-X-Y report from METR repo."""
     try:
         # List all directories in /reports/
         api_url = "https://api.github.com/repos/METR/eval-analysis-public/contents/reports"
-        response = requests.get(api_url, timeout=30)
+        response = (session or requests).get(api_url, timeout=30)
         response.raise_for_status()
         
         items = response.json()
@@ -60,54 +189,111 @@ def get_latest_metr_report() -> str:
         return "time-horizon-1-1"
 
 
-def main() -> None:
+def load_previous_manifest(index_path: Path) -> dict[str, dict[str, Any]]:
+    if not index_path.exists():
+        return {}
+    try:
+        index = read_json(index_path)
+    except ValueError:
+        return {}
+    return {
+        item["id"]: item
+        for item in index.get("items", [])
+        if item.get("id") and item.get("status") in USABLE_SOURCE_STATUSES
+    }
+
+
+def ingest_source(
+    source: dict[str, Any],
+    latest_report: Future[str],
+    previous: dict[str, dict[str, Any]],
+    session: requests.Session,
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    extension = EXT_BY_TYPE.get(source["source_type"], "txt")
+    target = SOURCES_DIR / f"{source['id']}.{extension}"
+    status = "ok"
+    error = ""
+    fetched: dict[str, Any] = {}
+
+    # Handle dynamic METR report URLs; only these sources wait on the GitHub lookup.
+    url = source["url"]
+    if "{LATEST_REPORT}" in url:
+        url = url.replace("{LATEST_REPORT}", latest_report.result())
+
+    # A changed URL (e.g. a new METR report) invalidates the cached validators.
+    prior = previous.get(source["id"])
+    if prior and prior.get("url") != url:
+        prior = None
+
+    try:
+        fetched = download_file(url, target, prior, session=session)
+        if not fetched["changed"]:
+            status = "unchanged"
+    except Exception as exc:  # pragma: no cover - network failures in CI
+        status = "error"
+        error = str(exc)
+
+    return {
+        "id": source["id"],
+        "benchmark": source["benchmark"],
+        "source_type": source["source_type"],
+        "url": url,  # Store the actual URL used
+        "parser": source.get("parser", "default_jsonl"),
+        "path": str(target),
+        "status": status,
+        "error": error,
+        "etag": fetched.get("etag", ""),
+        "last_modified": fetched.get("last_modified", ""),
+        "sha256": fetched.get("sha256", ""),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(conditional: bool = True, workers: int = DEFAULT_WORKERS) -> dict[str, Any]:
     ensure_dirs()
     registry = load_registry()
-    manifest: list[dict[str, str]] = []
-    
-    # Get latest METR report version once
-    latest_report = get_latest_metr_report()
-
-    for source in registry.get("sources", []):
-        extension = EXT_BY_TYPE.get(source["source_type"], "txt")
-        target = SOURCES_DIR / f"{source['id']}.{extension}"
-        status = "ok"
-        error = ""
-        
-        # Handle dynamic METR report URLs
-        url = source["url"]
-        if "{LATEST_REPORT}" in url:
-            url = url.replace("{LATEST_REPORT}", latest_report)
-        
-        try:
-            download_file(url, target)
-        except Exception as exc:  # pragma: no cover - network failures in CI
-            status = "error"
-            error = str(exc)
-        
-        manifest.append(
-            {
-                "id": source["id"],
-                "benchmark": source["benchmark"],
-                "source_type": source["source_type"],
-                "url": url,  # Store the actual URL used
-                "parser": source.get("parser", "default_jsonl"),
-                "path": str(target),
-                "status": status,
-                "error": error,
-            }
+    sources = registry.get("sources", [])
+    index_path = SOURCES_DIR / "index.json"
+    previous = load_previous_manifest(index_path) if conditional else {}
+    workers = max(1, workers)
+
+    started = time.perf_counter()
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        # Submitted first so a single worker still resolves it before any source needs it.
+        latest_report = pool.submit(get_latest_metr_report, session)
+        manifest = list(
+            pool.map(lambda source: ingest_source(source, latest_report, previous, session), sources)
         )
+        latest = latest_report.result()
 
-    write_json(
-        SOURCES_DIR / "index.json",
-        {
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "latest_metr_report": latest_report,
-            "items": manifest,
-        },
+    index = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "latest_metr_report": latest,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "items": manifest,
+    }
+    write_json(index_path, index)
+    unchanged = sum(1 for item in manifest if item["status"] == "unchanged")
+    print(
+        f"Ingest finished: {len(manifest)} sources processed, {unchanged} unchanged "
+        f"(latest METR: {latest})"
     )
-    print(f"Ingest finished: {len(manifest)} sources processed (latest METR: {latest_report})")
+    return index
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Download benchmark sources listed in data/benchmarks.yaml")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="skip conditional requests and re-download every source",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="number of sources to download concurrently (1 = sequential)",
+    )
+    args = parser.parse_args()
+    main(conditional=not args.force, workers=args.workers)
@@ -0,0 +1,170 @@
+"""Build the deployable site: compact data, content-hashed assets and precompressed siblings."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import math
+import re
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from pipeline.common import PROCESSED_DIR, ROOT, SITE_DIR, read_json, write_json
+
+try:
+    import brotli
+except ImportError:  # optional: pip install -e .[publish]
+    brotli = None
+
+PUBLISH_DIR = ROOT / "build" / "site"
+SIZE_REPORT_PATH = PROCESSED_DIR / "site_sizes.json"
+
+# Significant digits kept for floats in published JSON; charts and the table show at most four.
+PUBLISH_DIGITS = 6
+
+HASH_LENGTH = 12
+HASHED_NAME = re.compile(r"\.[0-9a-f]{%d}(?=\.)" % HASH_LENGTH)
+
+# Top-level assets renamed to content-hashed files. index.html names all three (data.json
+# through its ``site-data`` meta tag), so app.js stays unchanged when only the data does.
+HASHED_ASSETS = ("data.json", "styles.css", "app.js")
+
+
+def quantize_floats(value: Any, digits: int = PUBLISH_DIGITS) -> Any:
+    """``value`` with every float rounded to ``digits`` significant digits.
+
+    Integral results are written as ints, which JSON readers treat the same.
+    """
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return value
+        rounded = float(f"{value:.{digits}g}")
+        return int(rounded) if rounded.is_integer() and abs(rounded) < 2**53 else rounded
+    if isinstance(value, dict):
+        return {key: quantize_floats(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [quantize_floats(item, digits) for item in value]
+    return value
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name: str, data: bytes) -> str:
+    stem, dot, suffix = name.rpartition(".")
+    return f"{stem}.{content_hash(data)}{dot}{suffix}"
+
+
+def logical_name(name: str) -> str:
+    """``name`` without its content hash, e.g. ``data/table.json``."""
+    return HASHED_NAME.sub("", name)
+
+
+def _write_with_siblings(path: Path, data: bytes) -> dict[str, int | None]:
+    """Write ``data`` plus ``.gz`` and (with brotli installed) ``.br`` siblings; returns sizes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    # mtime=0 keeps the compressed bytes a pure function of the content.
+    gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + ".gz").write_bytes(gzipped)
+    sizes: dict[str, int | None] = {"raw": len(data), "gzip": len(gzipped), "brotli": None}
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        path.with_name(path.name + ".br").write_bytes(compressed)
+        sizes["brotli"] = len(compressed)
+    return sizes
+
+
+def build_site(site_dir: Path = SITE_DIR, out_dir: Path = PUBLISH_DIR) -> dict[str, dict[str, Any]]:
+    """Write the deployable copy of ``site_dir`` to ``out_dir``; returns sizes per asset.
+
+    ``data.json``, ``app.js`` and ``styles.css`` get content-hashed names and their
+    references in ``index.html`` are rewritten, so only ``index.html`` keeps a fixed name.
+    Data shards are already hashed and are copied as they are.
+    """
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    index_text = (site_dir / "index.html").read_text()
+
+    assets: dict[str, dict[str, Any]] = {}
+    for name in HASHED_ASSETS:
+        data = (site_dir / name).read_bytes()
+        file_name = hashed_name(name, data)
+        assets[name] = {"file": file_name, **_write_with_siblings(out_dir / file_name, data)}
+        index_text = index_text.replace(f'"./{name}"', f'"./{file_name}"')
+
+    index = index_text.encode("utf-8")
+    assets["index.html"] = {"file": "index.html", **_write_with_siblings(out_dir / "index.html", index)}
+
+    for path in sorted((site_dir / "data").glob("*.json")):
+        file_name = f"data/{path.name}"
+        assets[logical_name(file_name)] = {
+            "file": file_name,
+            **_write_with_siblings(out_dir / file_name, path.read_bytes()),
+        }
+    return assets
+
+
+def size_report(assets: dict[str, dict[str, Any]], previous: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Sizes per asset and in total, with the change from ``previous`` where it has one."""
+    previous_assets = (previous or {}).get("assets", {})
+    report_assets = {}
+    for name, sizes in sorted(assets.items()):
+        entry = dict(sizes)
+        before = previous_assets.get(name)
+        if before is not None:
+            entry["delta"] = {
+                kind: sizes[kind] - before[kind]
+                for kind in ("raw", "gzip", "brotli")
+                if sizes.get(kind) is not None and before.get(kind) is not None
+            }
+        report_assets[name] = entry
+
+    totals: dict[str, int | None] = {}
+    for kind in ("raw", "gzip", "brotli"):
+        sizes = [entry.get(kind) for entry in report_assets.values()]
+        totals[kind] = None if None in sizes else sum(sizes)
+    report: dict[str, Any] = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "assets": report_assets,
+        "totals": totals,
+    }
+    if previous:
+        before = previous.get("totals", {})
+        report["totals_delta"] = {
+            kind: totals[kind] - before[kind]
+            for kind in totals
+            if totals[kind] is not None and before.get(kind) is not None
+        }
+    return report
+
+
+def _kb(value: int | None) -> str:
+    return "-" if value is None else f"{value / 1024:.1f}"
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [f"{'asset':<40} {'raw KB':>9} {'gzip KB':>9} {'br KB':>9} {'Δ gzip KB':>10}"]
+    rows = [*report["assets"].items(), ("total", {**report["totals"], "delta": report.get("totals_delta")})]
+    for name, entry in rows:
+        delta = (entry.get("delta") or {}).get("gzip")
+        delta_text = "new" if entry.get("delta") is None and name != "total" else _kb(delta)
+        if delta is not None and delta > 0:
+            delta_text = "+" + delta_text
+        lines.append(
+            f"{name:<40} {_kb(entry['raw']):>9} {_kb(entry['gzip']):>9} {_kb(entry['brotli']):>9} {delta_text:>10}"
+        )
+    return "\n".join(lines)
+
+
+def publish(site_dir: Path = SITE_DIR, out_dir: Path = PUBLISH_DIR, report_path: Path = SIZE_REPORT_PATH) -> dict:
+    """Build ``out_dir`` from ``site_dir`` and record the size report at ``report_path``."""
+    previous = read_json(report_path) if report_path.exists() else None
+    report = size_report(build_site(site_dir, out_dir), previous)
+    write_json(report_path, report)
+    print(format_report(report))
+    if brotli is None:
+        print("brotli is not installed; skipped .br files (pip install -e .[publish])")
+    return report
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from pipeline.common import SNAPSHOTS_DIR, json_loads, read_json, write_json
+
+LEGACY_PATTERN = re.compile(r"^fits_(\d{8}T\d{6}Z)\.json$")
+
+
+def _canonical(value: Any) -> bytes:
+    # Always the stdlib encoding, so object hashes do not depend on the JSON backend.
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+class SnapshotStore:
+    """Content-addressed, gzip-compressed store of ``fits.json`` snapshots.
+
+    Every element of a snapshot's top-level lists (one curve, one model/domain row)
+    is stored once as ``objects/<sha256>.json.gz`` and shared by every snapshot
+    that contains it. A snapshot itself is a small tree object listing its scalars
+    and the hashes of its list elements; ``manifest.json`` maps each timestamp to
+    its tree hash. Restoring reassembles the exact payload that was saved.
+    """
+
+    def __init__(self, root: Path = SNAPSHOTS_DIR) -> None:
+        self.root = root
+        self.objects_dir = root / "objects"
+        self.manifest_path = root / "manifest.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / f"{digest}.json.gz"
+
+    def put_object(self, value: Any) -> str:
+        data = _canonical(value)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            # mtime=0 keeps the compressed bytes a pure function of the content.
+            tmp.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+            tmp.replace(path)
+        return digest
+
+    def get_object(self, digest: str) -> Any:
+        return json_loads(gzip.decompress(self._object_path(digest).read_bytes()))
+
+    def manifest(self) -> list[dict[str, str]]:
+        if not self.manifest_path.exists():
+            return []
+        return read_json(self.manifest_path).get("snapshots", [])
+
+    def save(self, payload: dict[str, Any], stamp: str) -> str:
+        """Store ``payload`` under timestamp ``stamp``; returns its tree hash."""
+        tree = {"scalars": {}, "lists": {}}
+        for key, value in payload.items():
+            if isinstance(value, list):
+                tree["lists"][key] = [self.put_object(item) for item in value]
+            else:
+                tree["scalars"][key] = value
+        digest = self.put_object(tree)
+
+        entries = {entry["timestamp"]: entry["hash"] for entry in self.manifest()}
+        entries[stamp] = digest
+        write_json(
+            self.manifest_path,
+            {"snapshots": [{"timestamp": t, "hash": h} for t, h in sorted(entries.items())]},
+        )
+        return digest
+
+    def load(self, stamp: str | None = None) -> dict[str, Any]:
+        """The snapshot saved at ``stamp`` (the latest one by default)."""
+        entries = self.manifest()
+        if not entries:
+            raise KeyError("Snapshot store is empty")
+        if stamp is None:
+            digest = entries[-1]["hash"]
+        else:
+            matches = [entry["hash"] for entry in entries if entry["timestamp"] == stamp]
+            if not matches:
+                raise KeyError(f"No snapshot at {stamp}")
+            digest = matches[0]
+        return self.load_tree(digest)
+
+    def load_tree(self, digest: str) -> dict[str, Any]:
+        tree = self.get_object(digest)
+        payload = dict(tree["scalars"])
+        for key, hashes in tree["lists"].items():
+            payload[key] = [self.get_object(h) for h in hashes]
+        return payload
+
+    def import_legacy(self, delete: bool = False) -> list[str]:
+        """Move ``fits_<stamp>.json`` files into the store, verifying each restore.
+
+        Returns the imported timestamps. With ``delete`` a file is removed only after
+        its restored payload compares equal to the original.
+        """
+        imported = []
+        for path in sorted(self.root.glob("fits_*.json")):
+            match = LEGACY_PATTERN.match(path.name)
+            if not match:
+                continue
+            payload = read_json(path)
+            digest = self.save(payload, match.group(1))
+            if self.load_tree(digest) != payload:
+                raise ValueError(f"Snapshot {path.name} did not round-trip exactly")
+            if delete:
+                path.unlink()
+            imported.append(match.group(1))
+        return imported
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect and restore fit snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="print snapshot timestamps and hashes")
+    restore = commands.add_parser("restore", help="write a snapshot back out as JSON")
+    restore.add_argument("timestamp", nargs="?", help="snapshot timestamp (default: latest)")
+    restore.add_argument("--output", type=Path, required=True)
+    migrate = commands.add_parser("import", help="move legacy fits_*.json files into the store")
+    migrate.add_argument("--keep", action="store_true", help="keep the legacy files after import")
+    args = parser.parse_args()
+
+    store = SnapshotStore()
+    if args.command == "list":
+        for entry in store.manifest():
+            print(f"{entry['timestamp']}  {entry['hash']}")
+    elif args.command == "restore":
+        write_json(args.output, store.load(args.timestamp))
+        print(f"Restored snapshot to {args.output}")
+    else:
+        imported = store.import_legacy(delete=not args.keep)
+        print(f"Imported {len(imported)} legacy snapshots")
+
+
+if __name__ == "__main__":
+    main()
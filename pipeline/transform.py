@@ -1,15 +1,58 @@
 from __future__ import annotations
 
+import argparse
+import contextlib
+import functools
+import hashlib
+import itertools
 import json
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import yaml
 
-from pipeline.common import PROCESSED_DIR, SOURCES_DIR, ensure_dirs, read_json, write_json
+from pipeline.common import (
+    CATEGORICAL_COLUMNS,
+    JSONL_BUFFER_BYTES,
+    PROCESSED_DIR,
+    SOURCES_DIR,
+    UNIFIED_JSONL,
+    UNIFIED_PARQUET,
+    UNIFIED_SCHEMA,
+    USABLE_SOURCE_STATUSES,
+    JsonlWriter,
+    UnifiedParquetWriter,
+    ensure_dirs,
+    json_loads,
+    read_json,
+    records_from_frame,
+    sha256_file,
+    write_json,
+)
 
 
+# Bump whenever normalize_run/normalize_runs_frame change their output for the same input.
+PARSER_VERSION = 1
+
+TRANSFORM_CACHE_DIR = PROCESSED_DIR / "transform_cache"
+
+# Parallel mode: a couple of shards per worker evens out skew; tiny sources stay serial.
+SHARDS_PER_WORKER = 2
+MIN_SHARD_BYTES = 4 << 20
+
+# Cached per-source rows also remember whether release_date came from the run itself,
+# so a release-date table change can be patched in without re-parsing the source.
+CACHE_SCHEMA = UNIFIED_SCHEMA.append(pa.field("release_date_from_run", pa.bool_()))
+
 TASK_DOMAIN_MAP: dict[str, str] = {
     # ── Cybersecurity ──
     "pico_ctf": "cybersecurity",
@@ -98,20 +141,92 @@ TASK_DOMAIN_MAP: dict[str, str] = {
 }
 
 
+# Substring fallbacks for task families missing from TASK_DOMAIN_MAP, in priority order.
+DOMAIN_KEYWORDS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("cybersecurity", ("cyber", "ctf", "reverse_eng")),
+    ("software_engineering", ("swe", "software", "devops", "debug")),
+    ("reasoning", ("reason", "math", "logic")),
+)
+
+
 def infer_domain(text: str) -> str:
-    task_family = (text or "").strip().split()[0] if text else ""
+    parts = (text or "").split()
+    task_family = parts[0] if parts else ""
     if task_family in TASK_DOMAIN_MAP:
         return TASK_DOMAIN_MAP[task_family]
     value = (text or "").lower()
-    if any(k in value for k in ("cyber", "ctf", "reverse_eng")):
-        return "cybersecurity"
-    if any(k in value for k in ("swe", "software", "devops", "debug")):
-        return "software_engineering"
-    if any(k in value for k in ("reason", "math", "logic")):
-        return "reasoning"
+    for domain, keywords in DOMAIN_KEYWORDS:
+        if any(k in value for k in keywords):
+            return domain
     return "unknown"
 
 
+class DomainClassifier:
+    """Cached equivalent of ``infer_domain`` for classifying many runs.
+
+    The keyword fallbacks are compiled into a single regex of lookaheads, so one
+    scan finds every keyword start and the highest-priority domain wins, exactly
+    as the sequential ``any`` checks would. Results are memoized per
+    ``(task_family, task_id)``: runs repeat the same few hundred tasks, and the
+    keyword scan can match anywhere in the id, so the full id is part of the key.
+    """
+
+    def __init__(
+        self,
+        domain_map: dict[str, str] | None = None,
+        keywords: tuple[tuple[str, tuple[str, ...]], ...] = DOMAIN_KEYWORDS,
+        maxsize: int = 16_384,
+    ) -> None:
+        self.domain_map = TASK_DOMAIN_MAP if domain_map is None else domain_map
+        self._domains = [domain for domain, _ in keywords]
+        alternatives = "|".join(
+            f"(?P<d{i}>{'|'.join(map(re.escape, words))})" for i, (_, words) in enumerate(keywords)
+        )
+        self._keyword_re = re.compile(f"(?=(?:{alternatives}))")
+        self.unknown_families: set[str] = set()
+        self._cached = functools.lru_cache(maxsize=maxsize)(self._classify_pair)
+        self._merged = {"hits": 0, "misses": 0}
+
+    def classify_text(self, text: str) -> str:
+        parts = (text or "").split()
+        task_family = parts[0] if parts else ""
+        if task_family in self.domain_map:
+            return self.domain_map[task_family]
+        best = len(self._domains)
+        for match in self._keyword_re.finditer((text or "").lower()):
+            best = min(best, int(match.lastgroup[1:]))
+            if best == 0:
+                break
+        if best < len(self._domains):
+            return self._domains[best]
+        self.unknown_families.add(task_family)
+        return "unknown"
+
+    def _classify_pair(self, task_family: str, task_id: str) -> str:
+        return self.classify_text(f"{task_family} {task_id}")
+
+    def classify(self, task_family: str, task_id: str) -> str:
+        return self._cached(task_family, task_id)
+
+    def stats(self) -> dict[str, Any]:
+        info = self._cached.cache_info()
+        hits = info.hits + self._merged["hits"]
+        misses = info.misses + self._merged["misses"]
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            "unknown_families": sorted(self.unknown_families),
+        }
+
+    def merge_stats(self, stats: dict[str, Any]) -> None:
+        """Fold in ``stats()`` from a classifier that ran in another process."""
+        self._merged["hits"] += stats["hits"]
+        self._merged["misses"] += stats["misses"]
+        self.unknown_families.update(stats["unknown_families"])
+
+
 def load_release_dates(path: Path) -> dict[str, str]:
     if not path.exists():
         return {}
@@ -121,19 +236,12 @@ def load_release_dates(path: Path) -> dict[str, str]:
     return {}
 
 
-def parse_jsonl(path: Path) -> list[dict[str, Any]]:
-    records = []
-    for line in path.read_text().splitlines():
-        if line.strip():
-            records.append(json.loads(line))
-    return records
-
-
 def normalize_run(
     run: dict[str, Any],
     benchmark: str,
     source_id: str,
     release_dates: dict[str, str],
+    classifier: DomainClassifier | None = None,
 ) -> dict[str, Any]:
     model = str(run.get("alias") or run.get("model") or run.get("agent") or "unknown")
     task_family = str(run.get("task_family") or "")
@@ -157,7 +265,11 @@ def normalize_run(
 
     return {
         "benchmark": benchmark,
-        "domain": infer_domain(f"{task_family} {task_id}"),
+        "domain": (
+            classifier.classify(task_family, task_id)
+            if classifier is not None
+            else infer_domain(f"{task_family} {task_id}")
+        ),
         "subdomain": task_family or "unknown",
         "model": model,
         "agent": str(run.get("alias") or model),
@@ -171,61 +283,484 @@ def normalize_run(
     }
 
 
-def main() -> None:
+def _column(frame: pd.DataFrame, name: str) -> pd.Series:
+    if name in frame:
+        return frame[name]
+    return pd.Series(None, index=frame.index, dtype=object)
+
+
+def _truthy(values: pd.Series) -> pd.Series:
+    if isinstance(values.dtype, pd.StringDtype):
+        return values.notna() & values.ne("")
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        return values.notna() & values.ne(0)
+    return values.notna() & values.astype(bool)
+
+
+def _coalesce(candidates: list[pd.Series], default: str) -> pd.Series:
+    """Vectorized ``str(a or b or ... or default)``."""
+    result = pd.Series(default, index=candidates[0].index)
+    for values in reversed(candidates):
+        if not isinstance(values.dtype, pd.StringDtype):
+            values = values.astype(object)
+        result = values.where(_truthy(values), result)
+    return result.astype(str)
+
+
+def _numeric(values: pd.Series) -> pd.Series:
+    """Floats with NaN for missing and empty-string values."""
+    if not pd.api.types.is_numeric_dtype(values.dtype):
+        values = pd.to_numeric(values.mask(values.eq("")), errors="raise")
+    return values.astype(float)
+
+
+def normalize_runs_frame(
+    runs: pd.DataFrame,
+    benchmark: str,
+    source_id: str,
+    release_dates: dict[str, str],
+    classifier: DomainClassifier | None = None,
+) -> pd.DataFrame:
+    """Batch version of ``normalize_run`` over a DataFrame of raw runs.
+
+    Produces the unified columns in schema order, row for row identical to the
+    scalar path once ``records_from_frame`` turns NaN back into ``None``.
+    """
+    alias = _column(runs, "alias")
+    model = _coalesce([alias, _column(runs, "model"), _column(runs, "agent")], "unknown")
+    task_family = _coalesce([_column(runs, "task_family")], "")
+    task_id = _coalesce([_column(runs, "task_id")], "")
+
+    score_bin = _numeric(_column(runs, "score_binarized"))
+    score_cont = _numeric(_column(runs, "score_cont"))
+    thresholded = (score_cont >= 0.5).astype(float).where(score_cont.notna())
+    score_bin_filled = score_bin.where(score_bin.notna(), thresholded)
+    score_cont_filled = score_cont.where(score_cont.notna(), score_bin)
+
+    release_date = _coalesce(
+        [_column(runs, "release_date"), model.map(release_dates), model.str.lower().map(release_dates)],
+        "",
+    )
+
+    # Few distinct tasks per many runs: classify each once and broadcast.
+    classifier = classifier or DomainClassifier()
+    codes, _ = pd.factorize(task_family + " " + task_id)
+    first = np.unique(codes, return_index=True)[1]
+    labels = [
+        classifier.classify(family, task)
+        for family, task in zip(task_family.to_numpy()[first], task_id.to_numpy()[first])
+    ]
+    domains = pd.Categorical(np.array(labels, dtype=object)[codes])
+
+    return pd.DataFrame(
+        {
+            "benchmark": benchmark,
+            "domain": domains,
+            "subdomain": task_family.where(task_family != "", "unknown"),
+            "model": model,
+            "agent": _coalesce([alias, model], "unknown"),
+            "release_date": release_date,
+            "human_minutes": _numeric(_column(runs, "human_minutes")).fillna(0.0),
+            "score": score_cont_filled.fillna(0.0),
+            "score_binarized": score_bin_filled.fillna(0).astype("int64"),
+            "tokens_count": _numeric(_column(runs, "tokens_count")),
+            "generation_cost": _numeric(_column(runs, "generation_cost")),
+            "source": source_id,
+        },
+        index=runs.index,
+    )
+
+
+def fallback_record() -> dict[str, Any]:
+    # keeps downstream steps functional if upstream files change.
+    return {
+        "benchmark": "synthetic",
+        "domain": "software_engineering",
+        "subdomain": "fallback",
+        "model": "demo-model",
+        "agent": "demo-model",
+        "release_date": datetime.now(timezone.utc).date().isoformat(),
+        "human_minutes": 30.0,
+        "score": 0.55,
+        "score_binarized": 1,
+        "source": "fallback",
+    }
+
+
+def shard_ranges(path: Path, shards: int) -> list[tuple[int, int]]:
+    """Split ``path`` into at most ``shards`` byte ranges that end on newlines."""
+    size = path.stat().st_size
+    bounds = [0]
+    with path.open("rb") as handle:
+        for i in range(1, shards):
+            handle.seek(max(size * i // shards, bounds[-1]))
+            handle.readline()
+            bounds.append(min(handle.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _iter_range(path: Path, start: int, end: int) -> Iterator[dict[str, Any]]:
+    with path.open("rb", buffering=JSONL_BUFFER_BYTES) as handle:
+        handle.seek(start)
+        while handle.tell() < end:
+            line = handle.readline()
+            if not line:
+                break
+            if line.strip():
+                yield json_loads(line)
+
+
+def _iter_range_rows(
+    path: Path,
+    start: int,
+    end: int,
+    benchmark: str,
+    source_id: str,
+    release_dates: dict[str, str],
+    batch_rows: int | None,
+    classifier: DomainClassifier,
+) -> Iterator[tuple[dict[str, Any], bool]]:
+    """Yield ``(row, release_date_from_run)`` for the runs in one byte range.
+
+    With ``batch_rows`` runs are normalized with ``normalize_runs_frame`` in
+    DataFrame chunks of that many runs; otherwise one by one.
+    """
+    runs = _iter_range(path, start, end)
+    if not batch_rows:
+        for run in runs:
+            row = normalize_run(run, benchmark, source_id, release_dates, classifier)
+            yield row, bool(run.get("release_date"))
+        return
+    while chunk := list(itertools.islice(runs, batch_rows)):
+        raw = pd.DataFrame.from_records(chunk)
+        frame = normalize_runs_frame(raw, benchmark, source_id, release_dates, classifier)
+        yield from zip(records_from_frame(frame), _truthy(_column(raw, "release_date")).tolist())
+
+
+def write_unified(
+    rows: Iterable[dict[str, Any]],
+    output_path: Path,
+    columnar_path: Path | None = None,
+) -> dict[str, Any]:
+    """Write rows to ``output_path`` one line at a time and return the summary stats.
+
+    Only the row count and the distinct domain/benchmark names are kept, so memory
+    does not grow with the number of runs. With ``columnar_path`` the same rows are
+    also written to a Parquet file in fixed-size row groups.
+    """
+    count = 0
+    domains: set[str] = set()
+    benchmarks: set[str] = set()
+    with contextlib.ExitStack() as stack:
+        columnar = stack.enter_context(UnifiedParquetWriter(columnar_path)) if columnar_path else None
+        handle = stack.enter_context(JsonlWriter(output_path))
+
+        def emit(row: dict[str, Any]) -> None:
+            nonlocal count
+            handle.write(row)
+            if columnar is not None:
+                columnar.append(row)
+            count += 1
+            domains.add(row["domain"])
+            benchmarks.add(row["benchmark"])
+
+        for row in rows:
+            emit(row)
+        if not count:
+            emit(fallback_record())
+    return {"rows": count, "domains": sorted(domains), "benchmarks": sorted(benchmarks)}
+
+
+# Segments: a JSONL file plus a CACHE_SCHEMA Parquet file holding the same rows.
+# Per-source caches and parallel shards are segments, and the unified outputs are
+# assembled by concatenating them, so rows are serialized only once.
+
+
+def _write_segment(
+    rows: Iterable[tuple[dict[str, Any], bool]],
+    jsonl_path: Path,
+    parquet_path: Path,
+) -> dict[str, Any]:
+    count = 0
+    domains: set[str] = set()
+    benchmarks: set[str] = set()
+    with (
+        UnifiedParquetWriter(parquet_path, schema=CACHE_SCHEMA) as writer,
+        JsonlWriter(jsonl_path) as handle,
+    ):
+        for row, from_run in rows:
+            handle.write(row)
+            row["release_date_from_run"] = from_run
+            writer.append(row)
+            count += 1
+            domains.add(row["domain"])
+            benchmarks.add(row["benchmark"])
+    return {"rows": count, "domains": sorted(domains), "benchmarks": sorted(benchmarks)}
+
+
+def _merge_summaries(summaries: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    count = 0
+    domains: set[str] = set()
+    benchmarks: set[str] = set()
+    for summary in summaries:
+        count += summary["rows"]
+        domains.update(summary["domains"])
+        benchmarks.update(summary["benchmarks"])
+    return {"rows": count, "domains": sorted(domains), "benchmarks": sorted(benchmarks)}
+
+
+def _concat_segments(
+    segments: list[tuple[Path, Path]],
+    jsonl_path: Path,
+    parquet_path: Path,
+    schema: pa.Schema,
+) -> None:
+    """Concatenate segments byte for byte (JSONL) and batch by batch (Parquet)."""
+    tmp_jsonl = jsonl_path.with_name(jsonl_path.name + ".tmp")
+    tmp_parquet = parquet_path.with_name(parquet_path.name + ".tmp")
+    with tmp_jsonl.open("wb") as out:
+        for segment_jsonl, _ in segments:
+            with segment_jsonl.open("rb") as handle:
+                shutil.copyfileobj(handle, out)
+    dictionary = [name for name in CATEGORICAL_COLUMNS if name in schema.names]
+    with pq.ParquetWriter(tmp_parquet, schema, use_dictionary=dictionary, compression="zstd") as writer:
+        for _, segment_parquet in segments:
+            for batch in pq.ParquetFile(segment_parquet).iter_batches(columns=schema.names):
+                writer.write_batch(batch)
+    tmp_jsonl.replace(jsonl_path)
+    tmp_parquet.replace(parquet_path)
+
+
+_WORKER_STATE: dict[str, Any] = {}
+
+
+def _init_shard_worker(release_dates: dict[str, str]) -> None:
+    _WORKER_STATE["release_dates"] = release_dates
+
+
+def _normalize_shard(
+    path: str,
+    start: int,
+    end: int,
+    benchmark: str,
+    source_id: str,
+    batch_rows: int | None,
+    out_prefix: str,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Normalize one byte range of a JSONL source into a segment; runs in a worker."""
+    classifier = DomainClassifier()
+    rows = _iter_range_rows(
+        Path(path), start, end, benchmark, source_id, _WORKER_STATE["release_dates"], batch_rows, classifier
+    )
+    summary = _write_segment(rows, Path(out_prefix + ".jsonl"), Path(out_prefix + ".parquet"))
+    return summary, classifier.stats()
+
+
+def shard_pool(workers: int, release_dates: dict[str, str]) -> ProcessPoolExecutor:
+    """Process pool whose workers receive the release-date map once, at startup."""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_shard_worker,
+        initargs=(release_dates,),
+    )
+
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def source_fingerprint(item: dict[str, Any]) -> str:
+    """Everything besides release dates that determines a source's unified rows."""
+    content = item.get("sha256") or sha256_file(Path(item["path"]))
+    rules = _digest({"map": TASK_DOMAIN_MAP, "keywords": DOMAIN_KEYWORDS})
+    return _digest({"content": content, "parser_version": PARSER_VERSION, "domain_rules": rules})
+
+
+def _cache_paths(source_id: str) -> tuple[Path, Path]:
+    return TRANSFORM_CACHE_DIR / f"{source_id}.jsonl", TRANSFORM_CACHE_DIR / f"{source_id}.parquet"
+
+
+def _build_source_cache(
+    item: dict[str, Any],
+    release_dates: dict[str, str],
+    batch_rows: int | None,
+    classifier: DomainClassifier,
+    pool: ProcessPoolExecutor | None = None,
+    workers: int = 1,
+) -> dict[str, Any]:
+    """Normalize a source into its cache segment, sharded over ``pool`` when given.
+
+    Shards are byte ranges ending on newlines; their segments are concatenated in
+    file order, so the result is byte-identical to the serial path.
+    """
+    path = Path(item["path"])
+    jsonl_path, parquet_path = _cache_paths(item["id"])
+    size = path.stat().st_size
+    shards = min(workers * SHARDS_PER_WORKER, size // MIN_SHARD_BYTES) if pool is not None else 1
+    if shards <= 1:
+        rows = _iter_range_rows(
+            path, 0, size, item["benchmark"], item["id"], release_dates, batch_rows, classifier
+        )
+        return _write_segment(rows, jsonl_path, parquet_path)
+
+    with tempfile.TemporaryDirectory(dir=TRANSFORM_CACHE_DIR, prefix=f"{item['id']}-") as tmp:
+        prefixes = [str(Path(tmp) / f"shard_{i:04d}") for i in range(shards)]
+        futures = [
+            pool.submit(
+                _normalize_shard, str(path), start, end, item["benchmark"], item["id"], batch_rows, prefix
+            )
+            for (start, end), prefix in zip(shard_ranges(path, shards), prefixes)
+        ]
+        summaries = []
+        for future in futures:
+            summary, stats = future.result()
+            summaries.append(summary)
+            classifier.merge_stats(stats)
+        segments = [(Path(p + ".jsonl"), Path(p + ".parquet")) for p in prefixes[: len(futures)]]
+        _concat_segments(segments, jsonl_path, parquet_path, CACHE_SCHEMA)
+    return _merge_summaries(summaries)
+
+
+def _patch_release_dates(source_id: str, release_dates: dict[str, str]) -> None:
+    """Recompute only the release_date column of a cached source."""
+    jsonl_path, parquet_path = _cache_paths(source_id)
+    tmp_jsonl = jsonl_path.with_name(jsonl_path.name + ".tmp")
+    tmp_parquet = parquet_path.with_name(parquet_path.name + ".tmp")
+    with (
+        pq.ParquetWriter(tmp_parquet, CACHE_SCHEMA, compression="zstd") as writer,
+        JsonlWriter(tmp_jsonl) as handle,
+    ):
+        for batch in pq.ParquetFile(parquet_path).iter_batches(batch_size=65_536):
+            frame = batch.to_pandas()
+            model = frame["model"].astype(str)
+            looked_up = _coalesce([model.map(release_dates), model.str.lower().map(release_dates)], "")
+            frame["release_date"] = frame["release_date"].where(frame["release_date_from_run"], looked_up)
+            writer.write_table(pa.Table.from_pandas(frame, schema=CACHE_SCHEMA, preserve_index=False))
+            handle.write_many(records_from_frame(frame[UNIFIED_SCHEMA.names]))
+    tmp_jsonl.replace(jsonl_path)
+    tmp_parquet.replace(parquet_path)
+
+
+def refresh_source_cache(
+    items: list[dict[str, Any]],
+    release_dates: dict[str, str],
+    state: dict[str, Any],
+    batch_rows: int | None = None,
+    classifier: DomainClassifier | None = None,
+    pool: ProcessPoolExecutor | None = None,
+    workers: int = 1,
+) -> tuple[dict[str, Any], dict[str, list[str]]]:
+    """Bring the per-source row cache up to date and return the new state.
+
+    A source is re-normalized only when its fingerprint changed; when just the
+    release-date table changed its cached rows get the release_date column patched.
+    """
+    TRANSFORM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    classifier = classifier or DomainClassifier()
+    release_hash = _digest(release_dates)
+    previous = state.get("sources", {})
+    sources: dict[str, Any] = {}
+    actions: dict[str, list[str]] = {"reused": [], "patched": [], "normalized": []}
+    for item in items:
+        fingerprint = source_fingerprint(item)
+        cached = previous.get(item["id"], {})
+        cache_exists = all(path.exists() for path in _cache_paths(item["id"]))
+        if cached.get("fingerprint") != fingerprint or not cache_exists:
+            summary = _build_source_cache(item, release_dates, batch_rows, classifier, pool, workers)
+            actions["normalized"].append(item["id"])
+        elif cached.get("release_dates") != release_hash:
+            _patch_release_dates(item["id"], release_dates)
+            summary = cached["summary"]
+            actions["patched"].append(item["id"])
+        else:
+            summary = cached["summary"]
+            actions["reused"].append(item["id"])
+        sources[item["id"]] = {
+            "fingerprint": fingerprint,
+            "release_dates": release_hash,
+            "summary": summary,
+        }
+    return {"order": [item["id"] for item in items], "sources": sources}, actions
+
+
+def main(batch_rows: int | None = None, incremental: bool = True, workers: int = 1) -> None:
     ensure_dirs()
     index_path = SOURCES_DIR / "index.json"
     if not index_path.exists():
         raise FileNotFoundError("Missing data/sources/index.json; run pipeline.ingest first")
 
     index = read_json(index_path)
-    items = [item for item in index.get("items", []) if item.get("status") == "ok"]
+    items = [item for item in index.get("items", []) if item.get("status") in USABLE_SOURCE_STATUSES]
 
     release_dates: dict[str, str] = {}
     for item in items:
         if item.get("parser") == "release_dates_yaml":
             release_dates.update(load_release_dates(Path(item["path"])))
 
-    unified: list[dict[str, Any]] = []
-    for item in items:
-        if item.get("source_type") != "jsonl":
-            continue
-        rows = parse_jsonl(Path(item["path"]))
-        for run in rows:
-            unified.append(normalize_run(run, item["benchmark"], item["id"], release_dates))
-
-    if not unified:
-        # keeps downstream steps functional if upstream files change.
-        unified = [
-            {
-                "benchmark": "synthetic",
-                "domain": "software_engineering",
-                "subdomain": "fallback",
-                "model": "demo-model",
-                "agent": "demo-model",
-                "release_date": datetime.now(timezone.utc).date().isoformat(),
-                "human_minutes": 30.0,
-                "score": 0.55,
-                "score_binarized": 1,
-                "source": "fallback",
-            }
-        ]
-
-    output_path = PROCESSED_DIR / "unified_records.jsonl"
-    with output_path.open("w", encoding="utf-8") as handle:
-        for row in unified:
-            handle.write(json.dumps(row) + "\n")
+    classifier = DomainClassifier()
+    jsonl_items = [item for item in items if item.get("source_type") == "jsonl"]
+    state_path = PROCESSED_DIR / "transform_state.json"
+    state = read_json(state_path) if incremental and state_path.exists() else {}
+    if not jsonl_items:
+        state_path.unlink(missing_ok=True)
+        summary = write_unified(iter(()), UNIFIED_JSONL, UNIFIED_PARQUET)
+    else:
+        with contextlib.ExitStack() as stack:
+            pool = stack.enter_context(shard_pool(workers, release_dates)) if workers > 1 else None
+            new_state, actions = refresh_source_cache(
+                jsonl_items, release_dates, state, batch_rows, classifier, pool, workers
+            )
+        print("Transform sources: " + ", ".join(f"{len(ids)} {name}" for name, ids in actions.items()))
+        if UNIFIED_JSONL.exists() and UNIFIED_PARQUET.exists() and new_state == state:
+            print(f"Transform skipped: {len(jsonl_items)} sources unchanged")
+            return
+        summary = _merge_summaries(source["summary"] for source in new_state["sources"].values())
+        if summary["rows"]:
+            segments = [_cache_paths(source_id) for source_id in new_state["order"]]
+            _concat_segments(segments, UNIFIED_JSONL, UNIFIED_PARQUET, UNIFIED_SCHEMA)
+        else:
+            summary = write_unified(iter(()), UNIFIED_JSONL, UNIFIED_PARQUET)
+        write_json(state_path, new_state)
 
+    classifier_stats = classifier.stats()
     write_json(
         PROCESSED_DIR / "transform_summary.json",
         {
             "generated_at": datetime.now(timezone.utc).isoformat(),
-            "rows": len(unified),
-            "domains": sorted({r["domain"] for r in unified}),
-            "benchmarks": sorted({r["benchmark"] for r in unified}),
+            **summary,
+            "domain_classifier": classifier_stats,
         },
     )
-    print(f"Transform finished: {len(unified)} unified rows")
+    # Reused and patched sources never reach the classifier, so there may be no rate.
+    if classifier_stats["hit_rate"] is None:
+        detail = "domain classifier not run"
+    else:
+        detail = (
+            f"domain cache hit rate {classifier_stats['hit_rate']:.1%}, "
+            f"{len(classifier_stats['unknown_families'])} unmapped task families"
+        )
+    print(f"Transform finished: {summary['rows']} unified rows ({detail})")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Normalize ingested sources into unified records")
+    parser.add_argument(
+        "--batch-rows",
+        type=int,
+        default=None,
+        help="normalize JSONL sources with the vectorized path in chunks of this many runs",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore the per-source cache and re-normalize every source",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="normalize large JSONL sources in byte-range shards across this many processes",
+    )
+    args = parser.parse_args()
+    main(batch_rows=args.batch_rows, incremental=not args.full, workers=args.workers)
@@ -1,11 +1,31 @@
 async function loadData() {
-  const response = await fetch("./data.json", { cache: "no-store" });
+  // Published builds point this at a content-hashed copy of data.json.
+  const url = document.querySelector('meta[name="site-data"]')?.content || "./data.json";
+  // data.json is small and changes every refresh; revalidate it on each visit.
+  const response = await fetch(url, { cache: "no-cache" });
   if (!response.ok) {
-    throw new Error(`Cannot load data.json (${response.status})`);
+    throw new Error(`Cannot load ${url} (${response.status})`);
   }
   return response.json();
 }
 
+const SHARD_REQUESTS = new Map();
+
+function loadShard(path) {
+  if (!SHARD_REQUESTS.has(path)) {
+    // Shard names carry a content hash, so any cached copy is current.
+    const request = fetch(`./${path}`, { cache: "force-cache" }).then((response) => {
+      if (!response.ok) {
+        throw new Error(`Cannot load ${path} (${response.status})`);
+      }
+      return response.json();
+    });
+    request.catch(() => SHARD_REQUESTS.delete(path));
+    SHARD_REQUESTS.set(path, request);
+  }
+  return SHARD_REQUESTS.get(path);
+}
+
 const DOMAIN_LABELS = {
   cybersecurity: "Cybersecurity",
   ml_research: "ML / AI Research",
@@ -41,6 +61,7 @@ const APP_STATE = {
   storyStep: 0,
   doublingMonths: 6,
   userHasScrolled: false,
+  pendingSections: new Map(),
 };
 
 function labelDomain(domain) {
@@ -130,7 +151,7 @@ function hideTooltip() {
 }
 
 function prepareBubbleRows(data) {
-  const curveIndex = new Map(data.curves.map((row) => [`${row.model}__${row.domain}`, row]));
+  const curveIndex = new Map((data.curves || []).map((row) => [`${row.model}__${row.domain}`, row]));
 
   function successNear60(points) {
     if (!points || !points.length) return null;
@@ -153,7 +174,10 @@ function prepareBubbleRows(data) {
         ...row,
         horizon_minutes: safeNumber(row.horizon_minutes, 0),
         points: safeNumber(row.n_points, 0),
-        success60: successNear60(curve?.points || []),
+        success60:
+          "success_near_60_minutes" in row
+            ? safeNumber(row.success_near_60_minutes, null)
+            : successNear60(curve?.points || []),
       };
     })
     .filter((row) => row.horizon_minutes > 0 && row.success60 !== null);
@@ -1031,6 +1055,86 @@ function setupStoryScroller(data) {
   APP_STATE.scrollerReady = true;
 }
 
+// Sections whose data lives in a shard, fetched when one of their targets nears the viewport.
+const LAZY_SECTIONS = [
+  {
+    key: "curves",
+    targets: ["story-chart"],
+    async load(shards) {
+      const parts = await Promise.all(Object.values(shards.curves || {}).map(loadShard));
+      return parts.flat();
+    },
+    render(data) {
+      renderStoryChart(data, APP_STATE.storyStep);
+      setupStoryScroller(data);
+    },
+  },
+  {
+    key: "agent_economics",
+    targets: ["token-efficiency-chart", "cost-efficiency-chart"],
+    load: (shards) => loadShard(shards.economics),
+    render(data) {
+      renderTokenDotPlot(data);
+      setupSplitSelector(data);
+      renderCostScatter(data, APP_STATE.splitKey);
+    },
+  },
+  {
+    key: "table_rows",
+    targets: ["records-table"],
+    load: (shards) => loadShard(shards.table),
+    render: renderTable,
+  },
+];
+
+function loadSection(section) {
+  const { data } = APP_STATE;
+  if (data[section.key] !== undefined) {
+    return Promise.resolve();
+  }
+  if (!APP_STATE.pendingSections.has(section.key)) {
+    const pending = section.load(data.shards).then((value) => {
+      data[section.key] = value;
+      section.render(data);
+    });
+    pending.catch(() => APP_STATE.pendingSections.delete(section.key));
+    APP_STATE.pendingSections.set(section.key, pending);
+  }
+  return APP_STATE.pendingSections.get(section.key);
+}
+
+function observeLazySections() {
+  if (!APP_STATE.data.shards) return;
+  if (!("IntersectionObserver" in window)) {
+    LAZY_SECTIONS.forEach((section) => loadSection(section).catch(showError));
+    return;
+  }
+  const observer = new IntersectionObserver(
+    (entries) => {
+      entries
+        .filter((entry) => entry.isIntersecting)
+        .forEach((entry) => {
+          const section = LAZY_SECTIONS.find((s) => s.targets.includes(entry.target.id));
+          if (!section) return;
+          section.targets.forEach((id) => observer.unobserve(document.getElementById(id)));
+          loadSection(section).catch(showError);
+        });
+    },
+    { rootMargin: "600px 0px" }
+  );
+  LAZY_SECTIONS.forEach((section) =>
+    section.targets.forEach((id) => {
+      const el = document.getElementById(id);
+      if (el) observer.observe(el);
+    })
+  );
+}
+
+function showError(error) {
+  console.error(error);
+  document.body.innerHTML += `<p style="padding:1rem;color:#991b1b">${error.message}</p>`;
+}
+
 function renderAll() {
   const { data, activeDomains } = APP_STATE;
   if (!data) return;
@@ -1046,12 +1150,11 @@ function renderAll() {
   setupDoublingSlider(data);
   renderHeatmap(data);
   renderHeadlineChart(data);
-  renderTokenDotPlot(data);
-  setupSplitSelector(data);
-  renderCostScatter(data, APP_STATE.splitKey);
-  renderStoryChart(data, APP_STATE.storyStep);
-  renderTable(data);
-  setupStoryScroller(data);
+  LAZY_SECTIONS.forEach((section) => {
+    if (data[section.key] !== undefined) {
+      section.render(data);
+    }
+  });
 }
 
 async function init() {
@@ -1072,6 +1175,7 @@ async function init() {
     );
 
     renderAll();
+    observeLazySections();
     document.getElementById("generated-at").textContent = `Generated at: ${data.generated_at}`;
 
     let resizeTimer;
@@ -1085,8 +1189,7 @@ async function init() {
       }, 220);
     });
   } catch (error) {
-    console.error(error);
-    document.body.innerHTML += `<p style="padding:1rem;color:#991b1b">${error.message}</p>`;
+    showError(error);
   }
 }
 
@@ -0,0 +1,106 @@
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from pipeline import common
+from pipeline.common import (
+    JsonlWriter,
+    UnifiedParquetWriter,
+    UnifiedRecord,
+    iter_jsonl,
+    json_dumps,
+    json_loads,
+    read_json,
+    records_from_frame,
+    write_json,
+)
+
+BACKENDS = ["json", "orjson", "msgspec"]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Run a test once per JSON backend, skipping ones that are not installed."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    elif request.param == "msgspec":
+        pytest.importorskip("msgspec")
+        monkeypatch.setattr(common, "orjson", None)
+    else:
+        monkeypatch.setattr(common, "orjson", None)
+        monkeypatch.setattr(common, "msgspec", None)
+    return request.param
+
+
+@dataclasses.dataclass
+class Row:
+    model: str
+    score: float | None = None
+
+
+def test_json_round_trip_on_every_backend(backend, tmp_path) -> None:
+    payload = {"b": [1, 2.5, None], "a": {"nested": "é"}, "big": 2**70}
+    assert json_loads(json_dumps(payload)) == payload
+    assert json_dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+    assert json_loads(b'{"x": NaN}')["x"] != json_loads(b'{"x": NaN}')["x"]
+
+    write_json(tmp_path / "p.json", payload)
+    assert read_json(tmp_path / "p.json") == payload
+    assert (tmp_path / "p.json").read_text().startswith('{\n  "a"')
+
+
+def test_json_dumps_writes_non_finite_floats_as_null_on_every_backend(backend) -> None:
+    payload = {"nan": float("nan"), "inf": [float("inf"), -float("inf")], "row": Row("a", float("nan"))}
+    expected = {"nan": None, "inf": [None, None], "row": {"model": "a", "score": None}}
+    assert json_loads(json_dumps(payload)) == expected
+    assert json_loads(json_dumps({**payload, "big": 2**70}, indent=True)) == {**expected, "big": 2**70}
+
+
+def test_jsonl_writer_and_reader_on_every_backend(backend, tmp_path) -> None:
+    path = tmp_path / "rows.jsonl"
+    rows = [{"model": "a", "score": 1.0}, {"model": "b", "score": None}]
+    with JsonlWriter(path) as writer:
+        writer.write_many(rows)
+    path.write_bytes(path.read_bytes() + b"\n")
+
+    assert writer.rows == 2
+    assert list(iter_jsonl(path)) == rows
+    assert list(iter_jsonl(path, record_type=Row)) == [Row("a", 1.0), Row("b", None)]
+
+
+UNIFIED_ROW = {
+    "benchmark": "b", "domain": "reasoning", "subdomain": "s", "model": "m", "agent": "m",
+    "release_date": "", "human_minutes": 2.0, "score": 1.0, "score_binarized": 1, "source": "fallback",
+}
+
+
+def test_unified_records_read_and_write_like_dicts(backend, tmp_path) -> None:
+    path = tmp_path / "rows.jsonl"
+    rows = [UNIFIED_ROW, {**UNIFIED_ROW, "model": "n", "tokens_count": 10.0}]
+    with JsonlWriter(path) as writer:
+        writer.write_many(rows)
+
+    records = list(iter_jsonl(path, record_type=UnifiedRecord))
+    assert [record.to_dict() for record in records] == [UnifiedRecord.from_dict(row).to_dict() for row in rows]
+    assert records[0]["model"] == "m" and records[0].get("tokens_count") is None
+    assert records[0].domain is records[1].domain
+    with pytest.raises(KeyError):
+        records[0]["missing"]
+
+    copy = tmp_path / "copy.jsonl"
+    with JsonlWriter(copy) as writer:
+        writer.write_many(records)
+    assert list(iter_jsonl(copy)) == [record.to_dict() for record in records]
+
+
+def test_unified_records_from_frame_and_to_parquet(tmp_path) -> None:
+    frame = pd.DataFrame([UNIFIED_ROW, {**UNIFIED_ROW, "tokens_count": 5.0}])
+    records = UnifiedRecord.from_frame(frame)
+    assert records[0].tokens_count is None and records[1].tokens_count == 5.0
+
+    path = tmp_path / "rows.parquet"
+    with UnifiedParquetWriter(path) as writer:
+        for record in records:
+            writer.append(record)
+    assert records_from_frame(pd.read_parquet(path)) == [record.to_dict() for record in records]
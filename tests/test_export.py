@@ -0,0 +1,318 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from pipeline.common import iter_unified_frames, load_unified_frame, records_from_frame
+from pipeline.export import (
+    SHARDED_KEYS,
+    EconomicsAccumulator,
+    StratifiedSample,
+    _stratum_quota,
+    load_site_data,
+    scan_unified_records,
+    write_shard,
+    write_site_data,
+)
+from pipeline.transform import write_unified
+
+ROWS = [
+    {"benchmark": "b", "domain": "reasoning", "subdomain": "s", "model": "GPT-4o (Inspect)", "agent": "a",
+     "release_date": "", "human_minutes": 8.0, "score": 1.0, "score_binarized": 1, "tokens_count": 12000.0,
+     "generation_cost": 0.03, "source": "runs"},
+    {"benchmark": "b", "domain": "cybersecurity", "subdomain": "s", "model": "GPT-4o (Inspect)", "agent": "a",
+     "release_date": "", "human_minutes": 30.0, "score": 0.0, "score_binarized": 0, "tokens_count": 50000.0,
+     "generation_cost": None, "source": "runs"},
+    {"benchmark": "b", "domain": "reasoning", "subdomain": "s", "model": "o3 (Inspect)", "agent": "a",
+     "release_date": "", "human_minutes": 0.0, "score": 1.0, "score_binarized": 1, "tokens_count": None,
+     "generation_cost": None, "source": "runs"},
+    {"benchmark": "b", "domain": "reasoning", "subdomain": "s", "model": "human", "agent": "a",
+     "release_date": "", "human_minutes": 4.0, "score": 1.0, "score_binarized": 1, "tokens_count": 10.0,
+     "generation_cost": None, "source": "runs"},
+]
+
+
+def _write(tmp_path, rows):
+    jsonl, parquet = tmp_path / "unified.jsonl", tmp_path / "unified.parquet"
+    write_unified(iter(rows), jsonl, parquet)
+    return jsonl, parquet
+
+
+def test_iter_unified_frames_streams_both_formats(tmp_path) -> None:
+    rows = ROWS * 5
+    jsonl, parquet = _write(tmp_path, rows)
+    from_parquet = list(iter_unified_frames(batch_rows=3, jsonl_path=jsonl, parquet_path=parquet))
+    from_jsonl = list(iter_unified_frames(batch_rows=3, jsonl_path=jsonl, parquet_path=tmp_path / "none"))
+
+    assert [len(frame) for frame in from_parquet] == [3, 3, 3, 3, 3, 3, 2]
+    for frames in (from_parquet, from_jsonl):
+        assert [r for frame in frames for r in records_from_frame(frame)] == rows
+    assert list(iter_unified_frames(jsonl_path=tmp_path / "a", parquet_path=tmp_path / "b")) == []
+
+
+def test_economics_is_batch_independent(tmp_path) -> None:
+    rows = ROWS * 7
+    jsonl, parquet = _write(tmp_path, rows)
+    economics = EconomicsAccumulator()
+    sample = StratifiedSample(size=6)
+    for frame in iter_unified_frames(batch_rows=4, jsonl_path=jsonl, parquet_path=parquet):
+        economics.update(frame)
+        sample.update(frame)
+
+    whole = EconomicsAccumulator()
+    whole.update(load_unified_frame(jsonl_path=jsonl, parquet_path=parquet))
+    expected = whole.result()
+    assert economics.result() == expected
+    assert [m["model"] for m in expected["models"]] == ["GPT-4o (Inspect)", "o3 (Inspect)"]
+    gpt = expected["models"][0]
+    assert gpt["runs_total"] == 14 and gpt["domains"] == ["cybersecurity", "reasoning"]
+    assert math.isclose(gpt["empirical_blended_usd_per_1m_from_runs"], 0.03 / 12000 * 1e6)
+    # Three non-human strata plus the human one; the sample spreads across all of them.
+    assert len(sample.rows) == 6
+    assert {(r["domain"], r["model"]) for r in sample.rows} == {(r["domain"], r["model"]) for r in ROWS}
+
+
+def test_economics_update_treats_missing_strings_as_absent() -> None:
+    frame = pd.DataFrame(
+        {
+            "model": ["o3 (Inspect)", None],
+            "domain": [None, "reasoning"],
+            "human_minutes": [2.0, 3.0],
+            "score_binarized": [1, 1],
+            "tokens_count": [float("nan"), 100.0],
+            "generation_cost": [float("nan"), float("nan")],
+        }
+    )
+    economics = EconomicsAccumulator()
+    economics.update(frame)
+    [model] = economics.result()["models"]
+    assert model["model"] == "o3 (Inspect)" and model["domains"] == ["unknown"]
+    assert (model["runs_total"], model["runs_with_tokens"], model["tokens_per_minute"]) == (1, 0, None)
+
+
+# Hand-computed economics: GPT-4o has two runs with tokens (one successful, both
+# with a cost), one without minutes; model-x is unpriced; the rest are skipped.
+ECONOMICS_RUNS = [
+    {"model": "GPT-4o (Inspect)", "domain": "reasoning", "human_minutes": 10.0, "score_binarized": 1,
+     "tokens_count": 20000.0, "generation_cost": 0.05},
+    {"model": "GPT-4o (Inspect)", "domain": "cybersecurity", "human_minutes": 30.0, "score_binarized": 0,
+     "tokens_count": 60000.0, "generation_cost": 0.30},
+    {"model": "model-x", "domain": "reasoning", "human_minutes": 5.0, "score_binarized": 1,
+     "tokens_count": 5000.0, "generation_cost": None},
+    {"model": "GPT-4o (Inspect)", "domain": "reasoning", "human_minutes": 0.0, "score_binarized": 1,
+     "tokens_count": 500.0, "generation_cost": 0.01},
+    {"model": "model-x", "domain": None, "human_minutes": 2.0, "score_binarized": 1,
+     "tokens_count": None, "generation_cost": None},
+    {"model": "Human", "domain": "reasoning", "human_minutes": 4.0, "score_binarized": 1,
+     "tokens_count": 10.0, "generation_cost": 0.01},
+    {"model": None, "domain": "reasoning", "human_minutes": 4.0, "score_binarized": 1,
+     "tokens_count": 10.0, "generation_cost": 0.01},
+]
+
+
+def _assert_close(actual, expected) -> None:
+    if isinstance(expected, dict):
+        assert list(actual) == list(expected)
+        for key in expected:
+            _assert_close(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _assert_close(a, e)
+    elif isinstance(expected, float):
+        assert type(actual) is float and math.isclose(actual, expected, rel_tol=1e-12)
+    else:
+        assert actual == expected and type(actual) is type(expected)
+
+
+def _economics_model(model, domains, runs, per_minute, per_success_minute, price, empirical, scenarios) -> dict:
+    return {
+        "model": model,
+        "domains": domains,
+        "runs_total": runs[0],
+        "runs_with_tokens": runs[1],
+        "runs_success": runs[2],
+        "tokens_per_minute": per_minute,
+        "tokens_per_hour": per_minute * 60.0 if per_minute is not None else None,
+        "tokens_per_success_minute": per_success_minute,
+        "tokens_per_success_hour": per_success_minute * 60.0 if per_success_minute is not None else None,
+        "assumed_price_usd_per_1m": price,
+        "empirical_blended_usd_per_1m_from_runs": empirical,
+        "estimated_cost_scenarios": scenarios,
+    }
+
+
+def test_economics_matches_hand_computed_figures() -> None:
+    economics = EconomicsAccumulator()
+    frame = pd.DataFrame(ECONOMICS_RUNS)
+    economics.update(frame.iloc[:3])
+    economics.update(frame.iloc[3:])
+
+    gpt_price = {"input": 2.5, "output": 10.0}
+    # 120k tokens per successful hour at blended 6.25 / 4.75 / 3.25 USD per 1M tokens.
+    gpt_scenarios = {
+        "input_50_output_50": {"blended_usd_per_1m_tokens": 6.25, "usd_per_autonomous_hour": 0.75},
+        "input_70_output_30": {"blended_usd_per_1m_tokens": 4.75, "usd_per_autonomous_hour": 0.57},
+        "input_90_output_10": {"blended_usd_per_1m_tokens": 3.25, "usd_per_autonomous_hour": 0.39},
+    }
+    # Sorted by tokens per successful hour, missing last.
+    _assert_close(
+        economics.result()["models"],
+        [
+            _economics_model("model-x", ["reasoning", "unknown"], (2, 1, 1), 1000.0, 1000.0, None, None, {}),
+            _economics_model(
+                "GPT-4o (Inspect)", ["cybersecurity", "reasoning"], (3, 2, 1), 2000.0, 2000.0, gpt_price, 3.75,
+                gpt_scenarios,
+            ),
+        ],
+    )
+
+    by_domain = economics.domain_results()
+    _assert_close(
+        by_domain["cybersecurity"],
+        [_economics_model("GPT-4o (Inspect)", ["cybersecurity"], (1, 1, 0), 2000.0, None, gpt_price, 5.0, {})],
+    )
+    _assert_close(
+        by_domain["reasoning"],
+        [
+            _economics_model("model-x", ["reasoning"], (1, 1, 1), 1000.0, 1000.0, None, None, {}),
+            _economics_model(
+                "GPT-4o (Inspect)", ["reasoning"], (2, 1, 1), 2000.0, 2000.0, gpt_price, 2.5, gpt_scenarios
+            ),
+        ],
+    )
+    _assert_close(by_domain["unknown"], [_economics_model("model-x", ["unknown"], (1, 0, 0), None, None, None, None, {})])
+    assert list(by_domain) == ["cybersecurity", "reasoning", "unknown"]
+    assert EconomicsAccumulator().result()["models"] == []
+
+
+def _sample_frame(n: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    # One dominant stratum first in the file, then a few small ones.
+    domains = np.where(np.arange(n) < n * 0.8, "reasoning", rng.choice(["cybersecurity", "ml_research"], n))
+    models = np.where(np.arange(n) < n * 0.8, "a", rng.choice(["a", "b", "c"], n))
+    return pd.DataFrame(
+        {
+            "domain": domains,
+            "model": models,
+            "human_minutes": rng.uniform(1, 100, n).round(1),
+            "score": rng.integers(0, 2, n).astype(float),
+        }
+    )
+
+
+def test_stratified_sample_is_batch_independent_and_balanced() -> None:
+    frame = _sample_frame()
+    samples = []
+    for batch in (37, 500, len(frame)):
+        sample = StratifiedSample(size=60)
+        for start in range(0, len(frame), batch):
+            sample.update(frame.iloc[start : start + batch])
+            assert len(sample.kept) <= 60 + len(sample.counts)
+        samples.append(sample.rows)
+    assert samples[0] == samples[1] == samples[2]
+
+    strata = pd.DataFrame(samples[0]).groupby(["domain", "model"]).size()
+    counts = frame.groupby(["domain", "model"]).size()
+    quota = _stratum_quota(counts.tolist(), 60)
+    assert strata.sum() == 60
+    assert ((strata - counts.clip(upper=quota).loc[strata.index]).isin([0, 1])).all()
+
+    # Same as ranking each stratum's keys over the whole data at once.
+    keyed = frame.assign(_key=pd.util.hash_pandas_object(frame, index=False, hash_key=f"{20250301:016d}"))
+    keyed = keyed.sort_values("_key", kind="stable")
+    rank = keyed.groupby(["domain", "model"]).cumcount()
+    base = keyed[rank < quota]
+    expected = pd.concat([base, keyed[rank == quota].head(60 - len(base))])
+    assert sorted(map(tuple, pd.DataFrame(samples[0]).to_numpy())) == sorted(
+        map(tuple, expected.drop(columns="_key").to_numpy())
+    )
+
+
+def test_stratified_sample_seed_and_strata_are_configurable() -> None:
+    frame = _sample_frame()
+    first, other_seed, by_domain = StratifiedSample(40), StratifiedSample(40, seed=1), StratifiedSample(40, ["domain"])
+    for sample in (first, other_seed, by_domain):
+        sample.update(frame)
+    assert first.rows != other_seed.rows
+    assert {row["domain"] for row in by_domain.rows} == {"reasoning", "cybersecurity", "ml_research"}
+    assert len(by_domain.counts) == 3
+    assert _stratum_quota([5] * 100, 40) == 1 and _stratum_quota([1000, 3, 2], 500) == 495
+
+
+def test_scan_unified_records_feeds_every_consumer(monkeypatch) -> None:
+    frames = [pd.DataFrame({"x": [1, 2]}), pd.DataFrame({"x": [3]})]
+    monkeypatch.setattr("pipeline.export.iter_unified_frames", lambda: iter(frames))
+
+    class Recorder:
+        def __init__(self):
+            self.seen = []
+
+        def update(self, frame):
+            self.seen.extend(frame["x"])
+
+    first, second = Recorder(), Recorder()
+    scan_unified_records(first, second)
+    assert first.seen == second.seen == [1, 2, 3]
+
+
+def _site_payload() -> dict:
+    def curve(model: str, domain: str, success: float) -> dict:
+        return {
+            "model": model,
+            "domain": domain,
+            "points": [
+                {"minutes": 32.0, "success": 0.9, "success_smoothed": 0.9},
+                {"minutes": 64.0, "success": success, "success_smoothed": success},
+            ],
+        }
+
+    return {
+        "generated_at": "2026-01-01T00:00:00+00:00",
+        "domain_horizons": [{"domain": "reasoning", "horizon_p50_minutes": 40.0}],
+        "model_domain": [
+            {"model": "m", "domain": "reasoning", "horizon_minutes": 40.0},
+            {"model": "m", "domain": "cybersecurity", "horizon_minutes": 9.0},
+        ],
+        "curves": [curve("m", "reasoning", 0.5), curve("m", "cybersecurity", 0.1)],
+        "metr_headline": {"models": []},
+        "table_rows": ROWS,
+        "agent_economics": {"models": []},
+        "meta": {"domains": ["cybersecurity", "reasoning"], "rows": len(ROWS)},
+    }
+
+
+def test_site_data_is_sharded_and_round_trips(tmp_path) -> None:
+    payload = _site_payload()
+    manifest = write_site_data(payload, tmp_path)
+
+    assert not set(SHARDED_KEYS) & set(manifest)
+    assert sorted(manifest["shards"]["curves"]) == ["cybersecurity", "reasoning"]
+    assert [row["success_near_60_minutes"] for row in manifest["model_domain"]] == [0.5, 0.1]
+    restored = load_site_data(tmp_path)
+    assert restored["curves"] == payload["curves"][::-1]
+    restored["curves"] = payload["curves"]
+    assert restored == payload
+
+
+def test_shards_write_non_finite_floats_as_null(tmp_path) -> None:
+    curve = {"model": "m", "domain": "reasoning", "points": [{"minutes": 8.0, "success": float("nan")}]}
+    relative = write_shard("curves-reasoning", [curve], tmp_path / "shards")
+    text = (tmp_path / relative).read_text()
+    assert "NaN" not in text
+    assert json.loads(text)[0]["points"] == [{"minutes": 8.0, "success": None}]
+
+
+def test_unchanged_shards_keep_their_names(tmp_path) -> None:
+    payload = _site_payload()
+    first = write_site_data(payload, tmp_path)["shards"]
+    payload["generated_at"] = "2026-01-08T00:00:00+00:00"
+    payload["curves"][0]["points"][1]["success"] = 0.4
+    second = write_site_data(payload, tmp_path)["shards"]
+
+    assert second["table"] == first["table"] and second["economics"] == first["economics"]
+    assert second["curves"]["cybersecurity"] == first["curves"]["cybersecurity"]
+    assert second["curves"]["reasoning"] != first["curves"]["reasoning"]
+    on_disk = sorted(f"data/{path.name}" for path in (tmp_path / "data").iterdir())
+    assert on_disk == sorted([*second["curves"].values(), second["table"], second["economics"]])
@@ -1,4 +1,28 @@
-from pipeline.fit import estimate_horizon
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.fit import (
+    LOGIT_P80,
+    MISSING_DAY,
+    FitIndex,
+    ReleaseDateTable,
+    bootstrap_domain_horizons,
+    compute_doubling_months,
+    domain_doubling_months,
+    domain_task_table,
+    estimate_horizon,
+    estimate_horizon_arrays,
+    fit_all_groups,
+    fit_incremental,
+    fit_logistic_groups,
+    load_release_date_yaml,
+    logistic_horizons,
+    parse_release_days,
+    summarize_domains,
+)
 
 
 def test_estimate_horizon_returns_curve() -> None:
@@ -26,3 +50,274 @@ def test_estimate_horizon_handles_noisy_late_rebound() -> None:
     # First bin is already below 50%; late rebounds should not inflate horizon.
     assert horizon == 4.0
     assert all("success_smoothed" in p for p in curve)
+
+
+def test_estimate_horizon_arrays_matches_estimate_horizon() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n = int(rng.integers(0, 60))
+        scale = rng.uniform(0.7, 1.4, n)
+        minutes = rng.choice([0.0, 0.3, 1.0, 2.5, 7.0, 16.0, 45.0, 120.0, 600.0], size=n) * scale
+        success = (rng.random(n) < rng.random()).astype(int)
+        points = [{"human_minutes": m, "score_binarized": s} for m, s in zip(minutes, success)]
+
+        horizon, beta, curve = estimate_horizon(points)
+        v_horizon, v_beta, v_curve = estimate_horizon_arrays(minutes, success)
+        assert v_horizon == pytest.approx(horizon, rel=1e-12)
+        assert v_beta == pytest.approx(beta, abs=1e-9)
+        assert len(v_curve) == len(curve)
+        for got, want in zip(v_curve, curve):
+            assert got == pytest.approx(want, rel=1e-12)
+
+
+def test_fit_all_groups_matches_per_group_estimates() -> None:
+    rng = np.random.default_rng(1)
+    n = 3000
+    records = pd.DataFrame(
+        {
+            "model": pd.Categorical(rng.choice(["m1", "m2", "m3", "human"], n)),
+            "domain": pd.Categorical(rng.choice(["cybersecurity", "reasoning", "ml_research"], n)),
+            "release_date": rng.choice(["", "2024-01-01", "2025-03-04"], n),
+            "human_minutes": rng.choice([0.0, 0.5, 2.0, 8.0, 30.0, 240.0], n) * rng.uniform(0.8, 1.2, n),
+            "score_binarized": rng.integers(0, 2, n),
+        }
+    )
+    model_domain, curves, domain_stats = fit_all_groups(records)
+
+    for row, curve in zip(model_domain, curves):
+        group = records[(records["model"] == row["model"]) & (records["domain"] == row["domain"])]
+        points = group.to_dict("records")
+        horizon, beta, expected_curve = estimate_horizon(points)
+        dates = sorted(d for d in group["release_date"] if d)
+        assert row["horizon_minutes"] == round(horizon, 4)
+        assert row["beta_proxy"] == pytest.approx(round(beta, 6), abs=1e-6)
+        assert row["n_points"] == len(group)
+        assert row["release_date"] == (dates[-1] if dates else "")
+        assert curve["points"] == pytest.approx(expected_curve)
+
+    for domain, stats in domain_stats.items():
+        group = records[records["domain"] == domain]
+        horizon, _, _ = estimate_horizon(group.to_dict("records"))
+        assert stats["horizon"] == pytest.approx(horizon)
+        assert stats["points"] == len(group)
+        assert stats["median_minutes"] == pytest.approx(float(group["human_minutes"].median()))
+
+
+def test_fit_logistic_groups_recovers_parameters_in_one_batch() -> None:
+    rng = np.random.default_rng(2)
+    true_alpha = np.array([4.0, 2.0, 6.0])
+    true_beta = np.array([-1.0, -0.5, -1.5])
+    group_ids = np.repeat(np.arange(3), 20_000)
+    x = rng.uniform(-2, 10, group_ids.size)
+    p = 1 / (1 + np.exp(-(true_alpha[group_ids] + true_beta[group_ids] * x)))
+    y = (rng.random(group_ids.size) < p).astype(float)
+
+    alpha, beta = fit_logistic_groups(x, y, group_ids, 3)
+    assert alpha == pytest.approx(true_alpha, abs=0.15)
+    assert beta == pytest.approx(true_beta, abs=0.05)
+
+    # Solving groups together matches solving them one at a time.
+    for g in range(3):
+        mask = group_ids == g
+        a, b = fit_logistic_groups(x[mask], y[mask], np.zeros(mask.sum(), dtype=int), 1)
+        assert a[0] == pytest.approx(alpha[g]) and b[0] == pytest.approx(beta[g])
+
+    low, high = np.full(3, -2.0), np.full(3, 10.0)
+    p50 = logistic_horizons(alpha, beta, low, high)
+    p80 = logistic_horizons(alpha, beta, low, high, LOGIT_P80)
+    assert np.log2(p50) == pytest.approx(-alpha / beta)
+    assert (p80 < p50).all()
+    assert 1 / (1 + np.exp(-(alpha + beta * np.log2(p80)))) == pytest.approx(0.8)
+
+
+def test_fit_all_groups_logistic_mode_adds_p80_and_censors() -> None:
+    records = pd.DataFrame(
+        {
+            "model": ["a"] * 6 + ["b"] * 4 + ["c"],
+            "domain": ["reasoning"] * 11,
+            "release_date": [""] * 11,
+            "human_minutes": [1, 2, 4, 8, 16, 32, 1, 4, 16, 64, 0],
+            "score_binarized": [1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1],
+        }
+    )
+    model_domain, curves, domain_stats = fit_all_groups(records, method="logistic")
+    rows = {row["model"]: row for row in model_domain}
+
+    assert 1.0 < rows["a"]["horizon_p80_minutes"] < rows["a"]["horizon_minutes"] < 32.0
+    assert rows["a"]["logistic_beta"] < 0
+    # Always succeeds: censored at the longest observed task, like the binned fit.
+    assert rows["b"]["horizon_minutes"] == rows["b"]["horizon_p80_minutes"] == 64.0
+    assert rows["c"]["horizon_minutes"] == 0.0
+    assert domain_stats["reasoning"]["horizon_p80"] <= domain_stats["reasoning"]["horizon"]
+    assert [c["points"] for c in curves] == [c["points"] for c in fit_all_groups(records)[1]]
+
+    with pytest.raises(ValueError):
+        fit_all_groups(records, method="isotonic")
+
+
+def _bootstrap_records() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    n = 4000
+    task = rng.integers(0, 60, n)
+    minutes = np.exp2(task % 12 - 2.0)
+    p = 1 / (1 + np.exp(-(3.0 - 0.8 * np.log2(minutes))))
+    return pd.DataFrame(
+        {
+            "benchmark": "metr_hcast",
+            "domain": np.where(task < 30, "reasoning", "cybersecurity"),
+            "subdomain": [f"family_{t}" for t in task],
+            "model": rng.choice(["m1", "m2"], n),
+            "release_date": "",
+            "human_minutes": minutes,
+            "score_binarized": (rng.random(n) < p).astype(int),
+        }
+    )
+
+
+def test_domain_task_table_groups_runs_by_task() -> None:
+    records = _bootstrap_records()
+    table = domain_task_table(records)
+    assert sorted(table) == ["cybersecurity", "reasoning"]
+    assert table["reasoning"]["runs"].size == 30
+    assert sum(t["runs"].sum() for t in table.values()) == len(records)
+    shuffled = domain_task_table(records.sample(frac=1, random_state=0))
+    for domain, columns in table.items():
+        for name, values in columns.items():
+            assert np.array_equal(values, shuffled[domain][name])
+
+
+@pytest.mark.parametrize("method", ["binned", "logistic"])
+def test_bootstrap_domain_horizons_is_deterministic_across_workers(method) -> None:
+    records = _bootstrap_records()
+    serial = bootstrap_domain_horizons(records, replicates=250, method=method, workers=1)
+    parallel = bootstrap_domain_horizons(records, replicates=250, method=method, workers=2)
+    assert serial == parallel
+
+    _, _, domain_stats = fit_all_groups(records, method=method)
+    for domain, (low, high) in serial.items():
+        assert low <= domain_stats[domain]["horizon"] <= high
+        assert low < high
+
+    reseeded = bootstrap_domain_horizons(records, replicates=250, method=method, seed=7)
+    assert reseeded != serial
+
+
+def _synthetic_fit(n_models: int, n_domains: int):
+    rng = np.random.default_rng(n_models * n_domains)
+    model_domain = [
+        {
+            "model": f"model-{m}",
+            "domain": f"domain-{d}",
+            "release_date": f"{2022 + m % 4}-{1 + m % 12:02d}-01",
+            "horizon_minutes": float(rng.uniform(1, 240)),
+        }
+        for d in range(n_domains)
+        for m in range(n_models)
+    ]
+    domain_stats = {
+        f"domain-{d}": {"horizon": 10.0, "points": n_models, "median_minutes": 5.0}
+        for d in range(n_domains)
+    }
+    return model_domain, domain_stats
+
+
+def test_fit_index_lookups() -> None:
+    model_domain, _ = _synthetic_fit(4, 3)
+    model_domain[0]["release_date"] = ""
+    model_domain[4]["release_date"] = "2030-01-01"
+    index = FitIndex(model_domain)
+    assert [r["model"] for r in index.domain_rows("domain-1")] == [f"model-{m}" for m in range(4)]
+    assert [r["domain"] for r in index.model_rows("model-0")] == ["domain-0", "domain-1", "domain-2"]
+    assert index.latest_release["model-0"] == "2030-01-01"
+    assert index.domain_rows("missing") == []
+
+
+class _CountingRow(dict):
+    reads = 0
+
+    def __getitem__(self, key):
+        _CountingRow.reads += 1
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        _CountingRow.reads += 1
+        return super().get(key, default)
+
+
+def test_summarize_domains_scales_linearly() -> None:
+    for n_models, n_domains in ((25, 10), (100, 40)):
+        model_domain, domain_stats = _synthetic_fit(n_models, n_domains)
+        rows = [_CountingRow(row) for row in model_domain]
+        _CountingRow.reads = 0
+        summarize_domains(domain_stats, FitIndex(rows))
+        # A bounded number of reads per row; a per-domain rescan of every row
+        # would need at least n_domains reads each.
+        assert _CountingRow.reads <= 8 * len(rows)
+
+
+def test_release_date_table_resolves_run_and_yaml_dates(tmp_path) -> None:
+    path = tmp_path / "release_dates.yaml"
+    path.write_text("date:\n  Claude 3 Opus: 2024-03-04\n  Claude 3.5 Sonnet (New): 2024-10-22\n  gpt-4o: 2024-05-13\n")
+    yaml_dates = load_release_date_yaml(path)
+    assert yaml_dates["Claude 3 Opus"] == "2024-03-04"
+
+    table = ReleaseDateTable.build(
+        {
+            "Claude 3 Opus (Inspect)": "",
+            "Claude 3.5 Sonnet (New) (Inspect)": "",
+            "GPT-4o": "",
+            "o3": "2025-04-16T09:30:00Z",
+            "mystery": "",
+        },
+        yaml_dates,
+    )
+    days = table.lookup(["Claude 3 Opus (Inspect)", "Claude 3.5 Sonnet (New) (Inspect)", "GPT-4o", "o3", "mystery", "absent"])
+    expected = parse_release_days(["2024-03-04", "2024-10-22", "2024-05-13", "2025-04-16"])
+    assert days[:4].tolist() == expected.tolist()
+    assert days[4] == days[5] == MISSING_DAY
+    assert parse_release_days(["1970-01-02", "not a date"]).tolist() == [1, MISSING_DAY]
+
+
+def test_domain_doubling_months_matches_per_domain_regression() -> None:
+    model_domain, _ = _synthetic_fit(12, 5)
+    for i, row in enumerate(model_domain):
+        m = int(row["model"].split("-")[1])
+        row["horizon_minutes"] = 2 ** (2 * (m % 4) + (m % 12) / 6 + 0.3 * (i % 3))
+    index = FitIndex(model_domain)
+    releases = ReleaseDateTable.build(index.latest_release, {})
+
+    doubling = domain_doubling_months(index, releases)
+    for domain, rows in index.by_domain.items():
+        expected = compute_doubling_months(rows)
+        assert doubling[domain]["doubling_months"] == pytest.approx(expected)
+
+    intervals = domain_doubling_months(index, releases, replicates=200)
+    assert intervals == domain_doubling_months(index, releases, replicates=200)
+    for domain, trend in intervals.items():
+        assert trend["ci_low_months"] <= trend["doubling_months"] <= trend["ci_high_months"]
+
+
+def test_fit_incremental_refits_only_changed_groups() -> None:
+    records = _bootstrap_records()
+    results, cache, refit = fit_incremental(records, {}, replicates=50)
+    assert refit == {"groups": 4, "domains": 2}
+    model_domain, curves, domain_stats = fit_all_groups(records)
+    assert results["model_domain"] == model_domain
+    assert results["curves"] == curves
+    assert results["domain_stats"] == domain_stats
+
+    reordered = records.iloc[::-1].reset_index(drop=True)
+    again, _, refit = fit_incremental(reordered, json.loads(json.dumps(cache)), replicates=50)
+    assert refit == {"groups": 0, "domains": 0}
+    assert again["intervals"] == results["intervals"]
+
+    changed = records.copy()
+    target = (changed["model"] == "m1") & (changed["domain"] == "reasoning")
+    changed.loc[target, "score_binarized"] = 1 - changed.loc[target, "score_binarized"]
+    partial, _, refit = fit_incremental(changed, cache, replicates=50)
+    assert refit == {"groups": 1, "domains": 1}
+    full, _, _ = fit_incremental(changed, {}, replicates=50)
+    assert partial == full
+
+    _, _, refit = fit_incremental(records, cache, method="logistic", replicates=50)
+    assert refit == {"groups": 4, "domains": 2}
@@ -0,0 +1,52 @@
+from pipeline.history import HistoryIndex, snapshot_rows
+from pipeline.snapshots import SnapshotStore
+
+
+def _payload(horizon: float, model_horizon: float) -> dict:
+    return {
+        "generated_at": "2026-02-23T19:32:51+00:00",
+        "domain_horizons": [
+            {"domain": "cybersecurity", "horizon_p50_minutes": horizon, "doubling_time_months": None},
+            {"domain": "reasoning", "horizon_p50_minutes": 2.0, "doubling_time_months": 7.5},
+        ],
+        "model_domain": [
+            {"model": "a", "domain": "cybersecurity", "horizon_minutes": model_horizon, "n_points": 10},
+        ],
+        "curves": [],
+    }
+
+
+def test_snapshot_rows_keeps_numeric_fields_only() -> None:
+    rows = snapshot_rows("20260101T000000Z", _payload(8.0, 4.0))
+    assert set(rows["metric"]) == {"horizon_p50_minutes", "doubling_time_months", "horizon_minutes", "n_points"}
+    assert len(rows) == 5
+    assert set(rows.loc[rows["level"] == "domain", "model"]) == {""}
+
+
+def test_history_index_sync_append_and_queries(tmp_path) -> None:
+    store = SnapshotStore(tmp_path / "snapshots")
+    store.save(_payload(8.0, 4.0), "20260101T000000Z")
+    store.save(_payload(9.0, 4.5), "20260108T000000Z")
+    index = HistoryIndex(tmp_path / "history")
+
+    assert index.sync(store) == ["20260101T000000Z", "20260108T000000Z"]
+    assert index.sync(store) == []
+
+    index.append("20260115T000000Z", _payload(12.0, 6.0))
+    index.append("20260115T000000Z", _payload(11.0, 6.0))  # rerun replaces, not duplicates
+    assert index.stamps() == ["20260101T000000Z", "20260108T000000Z", "20260115T000000Z"]
+    assert sorted(p.name for p in (tmp_path / "history").iterdir()) == [
+        f"{stamp}.parquet" for stamp in index.stamps()
+    ]
+
+    series = index.series("horizon_p50_minutes", "cybersecurity")
+    assert series.tolist() == [8.0, 9.0, 11.0]
+    assert str(series.index[0]) == "2026-01-01 00:00:00+00:00"
+    assert index.series("horizon_minutes", "cybersecurity", model="a", start="20260108T000000Z").tolist() == [4.5, 6.0]
+
+    assert index.sync(store) == []  # drops the stamp the store does not have
+    assert index.stamps() == ["20260101T000000Z", "20260108T000000Z"]
+
+    window = index.query(start="20260102T000000Z", end="20260110T000000Z", domains=["reasoning"])
+    assert set(window["timestamp"]) == {"20260108T000000Z"}
+    assert set(window["metric"]) == {"horizon_p50_minutes", "doubling_time_months"}
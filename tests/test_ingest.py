@@ -0,0 +1,167 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+import pytest
+import requests
+
+from pipeline import ingest
+from pipeline.common import read_json
+from pipeline.ingest import download_file
+
+BODY = b'{"alias": "model-a", "task_family": "pico_ctf"}\n'
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Shared by every server and subclass; reset before each test by _reset_requests_seen.
+    requests_seen: ClassVar[list[dict[str, str]]] = []
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        _Handler.requests_seen.append(dict(self.headers))
+        if self.path == "/flaky":
+            self._serve_flaky()
+            return
+        if self.path == "/no-validators":
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", "Mon, 02 Feb 2026 00:00:00 GMT")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def _serve_flaky(self) -> None:
+        # Drops the connection halfway on a full request; honours Range + If-Range.
+        requested = self.headers.get("Range")
+        if requested and self.headers.get("If-Range") == ETAG:
+            offset = int(requested.removeprefix("bytes=").rstrip("-"))
+            self.send_response(206)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Range", f"bytes {offset}-{len(BODY) - 1}/{len(BODY)}")
+            self.send_header("Content-Length", str(len(BODY) - offset))
+            self.end_headers()
+            self.wfile.write(BODY[offset:])
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY[:20])
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _reset_requests_seen():
+    _Handler.requests_seen.clear()
+
+
+@pytest.fixture()
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_file_revalidates_with_etag(server_url, tmp_path) -> None:
+    target = tmp_path / "runs.jsonl"
+    first = download_file(f"{server_url}/runs.jsonl", target)
+    assert first["changed"] is True
+    assert first["etag"] == ETAG
+    assert first["sha256"] == hashlib.sha256(BODY).hexdigest()
+    assert target.read_bytes() == BODY
+
+    second = download_file(f"{server_url}/runs.jsonl", target, first)
+    assert second["changed"] is False
+    assert second["sha256"] == first["sha256"]
+    assert _Handler.requests_seen[-1]["If-None-Match"] == ETAG
+
+
+def test_download_file_detects_identical_body_by_checksum(server_url, tmp_path) -> None:
+    target = tmp_path / "runs.jsonl"
+    first = download_file(f"{server_url}/no-validators", target)
+    mtime = target.stat().st_mtime_ns
+
+    second = download_file(f"{server_url}/no-validators", target, first)
+    assert second["changed"] is False
+    assert target.stat().st_mtime_ns == mtime
+
+
+def test_download_file_ignores_validators_when_target_missing(server_url, tmp_path) -> None:
+    target = tmp_path / "runs.jsonl"
+    previous = {"etag": ETAG, "sha256": hashlib.sha256(BODY).hexdigest()}
+    result = download_file(f"{server_url}/runs.jsonl", target, previous)
+    assert result["changed"] is True
+    assert target.read_bytes() == BODY
+    assert "If-None-Match" not in _Handler.requests_seen[-1]
+
+
+def test_download_file_keeps_target_intact_and_resumes(server_url, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(ingest, "CHUNK_SIZE", 8)
+    target = tmp_path / "runs.jsonl"
+    target.write_bytes(b"previous complete file\n")
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError, match="IncompleteRead"):
+        download_file(f"{server_url}/flaky", target)
+    assert target.read_bytes() == b"previous complete file\n"
+    partial = (tmp_path / "runs.jsonl.part").read_bytes()
+    assert partial and BODY.startswith(partial)
+
+    result = download_file(f"{server_url}/flaky", target)
+    assert _Handler.requests_seen[-1]["Range"] == f"bytes={len(partial)}-"
+    assert result["changed"] is True
+    assert result["sha256"] == hashlib.sha256(BODY).hexdigest()
+    assert target.read_bytes() == BODY
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["runs.jsonl"]
+
+
+def test_main_downloads_sources_concurrently(tmp_path, monkeypatch) -> None:
+    # Every request waits until all four are in flight; sequential fetching
+    # would break the barrier and fail the downloads.
+    barrier = threading.Barrier(4, timeout=5)
+
+    class _BarrierHandler(_Handler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            barrier.wait()
+            super().do_GET()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BarrierHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    sources = [
+        {"id": f"src_{i}", "benchmark": "b", "source_type": "jsonl", "url": f"{base}/{{LATEST_REPORT}}/{i}"}
+        for i in range(4)
+    ]
+    monkeypatch.setattr(ingest, "SOURCES_DIR", tmp_path)
+    monkeypatch.setattr(ingest, "ensure_dirs", lambda: None)
+    monkeypatch.setattr(ingest, "load_registry", lambda: {"sources": sources})
+    monkeypatch.setattr(ingest, "get_latest_metr_report", lambda session=None: "time-horizon-9-9")
+
+    try:
+        ingest.main(workers=4)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    index = read_json(tmp_path / "index.json")
+    assert [item["id"] for item in index["items"]] == [s["id"] for s in sources]
+    assert all(item["status"] == "ok" for item in index["items"])
+    assert all(item["url"].startswith(f"{base}/time-horizon-9-9/") for item in index["items"])
+    assert not barrier.broken
@@ -0,0 +1,56 @@
+import gzip
+import json
+
+from pipeline.publish import build_site, logical_name, quantize_floats, size_report
+
+
+def test_quantize_floats_keeps_significant_digits() -> None:
+    value = {"a": [0.123456789, 1234.56789123, 64.0, -0.046239], "b": True, "c": 3, "d": "x"}
+    assert quantize_floats(value) == {"a": [0.123457, 1234.57, 64, -0.046239], "b": True, "c": 3, "d": "x"}
+    assert isinstance(quantize_floats(64.0), int)
+
+
+def _site(tmp_path, data: dict) -> None:
+    (tmp_path / "data").mkdir(parents=True, exist_ok=True)
+    (tmp_path / "index.html").write_text(
+        '<meta name="site-data" content="./data.json" />'
+        '<link rel="stylesheet" href="./styles.css" /><script src="./app.js"></script>'
+    )
+    (tmp_path / "app.js").write_text('fetch("./data.json");')
+    (tmp_path / "styles.css").write_text("body { margin: 0; }")
+    (tmp_path / "data.json").write_text(json.dumps(data))
+    (tmp_path / "data" / "table.0123456789ab.json").write_text("[]")
+
+
+def test_build_site_hashes_assets_and_writes_compressed_siblings(tmp_path) -> None:
+    site, out = tmp_path / "site", tmp_path / "out"
+    _site(site, {"generated_at": "a"})
+    assets = build_site(site, out)
+
+    assert sorted(assets) == ["app.js", "data.json", "data/table.json", "index.html", "styles.css"]
+    index = (out / "index.html").read_text()
+    for name in ("data.json", "app.js", "styles.css"):
+        file_name = assets[name]["file"]
+        assert file_name != name and logical_name(file_name) == name
+        assert f'"./{file_name}"' in index
+        assert gzip.decompress((out / f"{file_name}.gz").read_bytes()) == (site / name).read_bytes()
+    # app.js is untouched, so it keeps its name when only the data changes.
+    (site / "data.json").write_text(json.dumps({"generated_at": "b"}))
+    rebuilt = build_site(site, out)
+    assert rebuilt["app.js"]["file"] == assets["app.js"]["file"]
+    assert rebuilt["data.json"]["file"] != assets["data.json"]["file"]
+    assert not (out / assets["data.json"]["file"]).exists()
+
+
+def test_size_report_compares_with_previous_build() -> None:
+    before = size_report({"app.js": {"file": "app.1.js", "raw": 100, "gzip": 40, "brotli": None}})
+    after = size_report(
+        {
+            "app.js": {"file": "app.2.js", "raw": 90, "gzip": 35, "brotli": None},
+            "data.json": {"file": "data.3.json", "raw": 10, "gzip": 8, "brotli": None},
+        },
+        before,
+    )
+    assert after["assets"]["app.js"]["delta"] == {"raw": -10, "gzip": -5}
+    assert "delta" not in after["assets"]["data.json"]
+    assert after["totals"]["raw"] == 100 and after["totals_delta"]["gzip"] == 3
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from pipeline.snapshots import SnapshotStore
+
+
+def _payload(horizon: float) -> dict:
+    return {
+        "generated_at": "2026-02-23T19:32:51+00:00",
+        "domain_horizons": [{"domain": "reasoning", "horizon_p50_minutes": horizon}],
+        "model_domain": [
+            {"model": "a", "domain": "reasoning", "horizon_minutes": 4.0},
+            {"model": "b", "domain": "reasoning", "horizon_minutes": horizon},
+        ],
+        "curves": [{"model": "a", "domain": "reasoning", "points": [{"minutes": 1.0, "success": 0.75}]}],
+    }
+
+
+def test_snapshot_store_dedups_records_and_restores_exactly(tmp_path) -> None:
+    store = SnapshotStore(tmp_path)
+    first = store.save(_payload(8.0), "20260101T000000Z")
+    objects = len(list(store.objects_dir.iterdir()))
+    second = store.save(_payload(9.5), "20260108T000000Z")
+
+    # Only the changed rows and the new tree are written for the second snapshot.
+    assert len(list(store.objects_dir.iterdir())) == objects + 3
+    assert store.save(_payload(8.0), "20260115T000000Z") == first
+    assert [e["timestamp"] for e in store.manifest()] == [
+        "20260101T000000Z",
+        "20260108T000000Z",
+        "20260115T000000Z",
+    ]
+    assert store.manifest()[1]["hash"] == second
+    assert store.load("20260108T000000Z") == _payload(9.5)
+    assert store.load() == _payload(8.0)
+    with pytest.raises(KeyError):
+        store.load("19990101T000000Z")
+
+
+def test_import_legacy_snapshots_round_trips_files(tmp_path) -> None:
+    legacy = tmp_path / "fits_20260213T112850Z.json"
+    legacy.write_text(json.dumps(_payload(3.0), indent=2, sort_keys=True))
+    store = SnapshotStore(tmp_path)
+
+    assert store.import_legacy(delete=True) == ["20260213T112850Z"]
+    assert not legacy.exists()
+    restored = json.dumps(store.load("20260213T112850Z"), indent=2, sort_keys=True)
+    assert restored == json.dumps(_payload(3.0), indent=2, sort_keys=True)
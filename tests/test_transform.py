@@ -1,4 +1,16 @@
-from pipeline.transform import infer_domain, normalize_run
+import json
+
+import pandas as pd
+
+from pipeline import transform
+from pipeline.common import iter_jsonl, json_dumps, load_unified_frame, records_from_frame
+from pipeline.transform import (
+    DomainClassifier,
+    infer_domain,
+    normalize_run,
+    normalize_runs_frame,
+    write_unified,
+)
 
 
 def test_infer_domain_explicit_map() -> None:
@@ -29,3 +41,204 @@ def test_normalize_run_maps_required_fields() -> None:
     assert out["release_date"] == "2025-06-01"
     assert out["score_binarized"] == 1
     assert out["human_minutes"] == 42.0
+
+
+def test_write_unified_streams_rows_and_tracks_summary(tmp_path) -> None:
+    runs = [
+        {"alias": "model-a", "task_family": "pico_ctf", "task_id": "pico_ctf/1", "score_binarized": 1},
+        {"alias": "model-b", "task_family": "mlab", "task_id": "mlab/1", "score_cont": 0.2},
+    ]
+    rows = (normalize_run(run, "metr_hcast", "src_1", {}) for run in runs)
+
+    output = tmp_path / "unified_records.jsonl"
+    summary = write_unified(rows, output)
+    assert summary == {
+        "rows": 2,
+        "domains": ["cybersecurity", "ml_research"],
+        "benchmarks": ["metr_hcast"],
+    }
+    assert [r["model"] for r in iter_jsonl(output)] == ["model-a", "model-b"]
+
+
+def test_write_unified_falls_back_when_empty(tmp_path) -> None:
+    output = tmp_path / "unified_records.jsonl"
+    summary = write_unified(iter(()), output)
+    assert summary["rows"] == 1
+    assert next(iter_jsonl(output))["source"] == "fallback"
+
+
+def test_columnar_output_matches_jsonl(tmp_path) -> None:
+    rows = [
+        normalize_run(
+            {"alias": "model-a", "task_family": "pico_ctf", "human_minutes": 3, "score_cont": 0.9},
+            "metr_hcast",
+            "src_1",
+            {},
+        ),
+        normalize_run(
+            {"alias": "model-b", "task_family": "mlab", "score_binarized": 0, "tokens_count": 1200},
+            "metr_hcast",
+            "src_1",
+            {"model-b": "2025-01-01"},
+        ),
+    ]
+    jsonl_path = tmp_path / "unified_records.jsonl"
+    parquet_path = tmp_path / "unified_records.parquet"
+    write_unified(iter(rows), jsonl_path, parquet_path)
+
+    columns = ["model", "domain", "human_minutes", "score_binarized", "tokens_count"]
+    columnar = load_unified_frame(columns, jsonl_path, parquet_path)
+    assert str(columnar["model"].dtype) == "category"
+    assert list(columnar.columns) == columns
+
+    parquet_path.unlink()
+    from_jsonl = load_unified_frame(columns, jsonl_path, parquet_path)
+    pd.testing.assert_frame_equal(columnar, from_jsonl, check_categorical=False)
+
+
+# Mirrors the field mix of METR's runs.jsonl, including the sparse and aliased columns.
+METR_SHAPED_RUNS = [
+    {
+        "run_id": "r1",
+        "alias": "Claude 3.7 Sonnet (Inspect)",
+        "model": "anthropic/claude-3-7-sonnet",
+        "task_family": "pico_ctf",
+        "task_id": "pico_ctf/104",
+        "score_binarized": 1,
+        "score_cont": 1.0,
+        "human_minutes": 12.5,
+        "tokens_count": 183204,
+        "generation_cost": 1.93,
+    },
+    {"run_id": "r2", "model": "gpt-4o", "task_family": "mlab", "task_id": "mlab/w1d1", "score_cont": 0.49},
+    {"run_id": "r3", "agent": "human", "task_family": "", "task_id": "ctf_like/3", "score_binarized": 0},
+    {"run_id": "r4", "alias": "", "model": "", "task_family": "swe_misc", "score_cont": 0.5, "tokens_count": ""},
+    {
+        "run_id": "r5",
+        "alias": "GPT-4o",
+        "task_family": "arithmetic",
+        "task_id": "arithmetic/1",
+        "human_minutes": 0,
+        "release_date": "2024-05-13",
+        "generation_cost": None,
+    },
+    {"run_id": "r6", "alias": "o3", "task_family": "new family", "task_id": "x/1", "score_binarized": 1},
+]
+
+
+def _expected_jsonl(runs: list[dict], release_dates: dict[str, str]) -> str:
+    frame = normalize_runs_frame(pd.DataFrame.from_records(runs), "metr_hcast", "src_1", release_dates)
+    return "".join(json_dumps(row).decode() + "\n" for row in records_from_frame(frame))
+
+
+def test_normalize_runs_frame_matches_scalar_path() -> None:
+    release_dates = {"gpt-4o": "2024-05-13", "o3": "2025-04-16"}
+    expected = [normalize_run(run, "metr_hcast", "src_1", release_dates) for run in METR_SHAPED_RUNS]
+    raw = pd.DataFrame.from_records(METR_SHAPED_RUNS)
+    frame = normalize_runs_frame(raw, "metr_hcast", "src_1", release_dates)
+    actual = records_from_frame(frame)
+    assert [json.dumps(row) for row in actual] == [json.dumps(row) for row in expected]
+
+
+def test_source_cache_batch_rows_matches_scalar_path(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(transform, "TRANSFORM_CACHE_DIR", tmp_path / "cache")
+    source = tmp_path / "runs.jsonl"
+    source.write_text("\n".join(json.dumps(run) for run in METR_SHAPED_RUNS) + "\n")
+    items = [{"id": "src_1", "benchmark": "metr_hcast", "source_type": "jsonl", "path": str(source)}]
+    release_dates = {"gpt-4o": "2024-05-13"}
+    cached_jsonl, _ = transform._cache_paths("src_1")
+    cached = []
+    for batch_rows in (None, 4):
+        transform.refresh_source_cache(items, release_dates, {}, batch_rows)
+        cached.append(cached_jsonl.read_text())
+    assert cached[0] == cached[1] == _expected_jsonl(METR_SHAPED_RUNS, release_dates)
+
+
+def test_domain_classifier_matches_infer_domain() -> None:
+    classifier = DomainClassifier()
+    cases = [
+        ("pico_ctf", "pico_ctf/104"),
+        ("mlab", "mlab/w1d1"),
+        ("", "ctf_like/3"),
+        ("", ""),
+        ("swe_misc", ""),
+        ("new family", "x/1"),
+        ("logictf", "logictf/1"),
+        ("Math_Olympiad", "m/2"),
+        ("devops_task", "reverse_engineering/1"),
+        ("totally_new_task", "totally_new_task/1"),
+    ]
+    for family, task_id in cases:
+        assert classifier.classify(family, task_id) == infer_domain(f"{family} {task_id}")
+
+
+def test_domain_classifier_reports_hits_and_unknown_families() -> None:
+    classifier = DomainClassifier()
+    for _ in range(3):
+        classifier.classify("pico_ctf", "pico_ctf/1")
+        classifier.classify("totally_new_task", "totally_new_task/1")
+    stats = classifier.stats()
+    assert stats["misses"] == 2
+    assert stats["hits"] == 4
+    assert stats["hit_rate"] == round(4 / 6, 4)
+    assert stats["unknown_families"] == ["totally_new_task"]
+    assert DomainClassifier().stats()["hit_rate"] is None
+
+
+def test_refresh_source_cache_reuses_and_patches(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(transform, "TRANSFORM_CACHE_DIR", tmp_path / "cache")
+    source = tmp_path / "runs.jsonl"
+    source.write_text("\n".join(json.dumps(run) for run in METR_SHAPED_RUNS) + "\n")
+    items = [{"id": "src_1", "benchmark": "metr_hcast", "source_type": "jsonl", "path": str(source)}]
+
+    state, actions = transform.refresh_source_cache(items, {"gpt-4o": "2024-05-13"}, {})
+    assert actions["normalized"] == ["src_1"]
+    assert state["sources"]["src_1"]["summary"]["rows"] == len(METR_SHAPED_RUNS)
+
+    same_state, actions = transform.refresh_source_cache(items, {"gpt-4o": "2024-05-13"}, state)
+    assert actions["reused"] == ["src_1"]
+    assert same_state == state
+
+    new_dates = {"gpt-4o": "2024-06-01", "o3": "2025-04-16"}
+    patched_state, actions = transform.refresh_source_cache(items, new_dates, state)
+    assert actions["patched"] == ["src_1"]
+    cached_jsonl, _ = transform._cache_paths("src_1")
+    assert cached_jsonl.read_text() == _expected_jsonl(METR_SHAPED_RUNS, new_dates)
+
+    source.write_text(json.dumps(METR_SHAPED_RUNS[0]) + "\n")
+    _, actions = transform.refresh_source_cache(
+        [{**items[0], "sha256": "changed"}], new_dates, patched_state
+    )
+    assert actions["normalized"] == ["src_1"]
+
+
+def test_shard_ranges_end_on_newlines(tmp_path) -> None:
+    source = tmp_path / "runs.jsonl"
+    source.write_text("".join(json.dumps(run) + "\n" for run in METR_SHAPED_RUNS * 5))
+    data = source.read_bytes()
+    ranges = transform.shard_ranges(source, 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert all(data[end - 1 : end] == b"\n" for _, end in ranges)
+
+
+def test_sharded_cache_build_is_byte_identical(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(transform, "TRANSFORM_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(transform, "MIN_SHARD_BYTES", 1)
+    source = tmp_path / "runs.jsonl"
+    source.write_text("".join(json.dumps(run) + "\n" for run in METR_SHAPED_RUNS * 10))
+    items = [{"id": "src_1", "benchmark": "metr_hcast", "source_type": "jsonl", "path": str(source)}]
+    release_dates = {"gpt-4o": "2024-05-13"}
+    expected = _expected_jsonl(METR_SHAPED_RUNS * 10, release_dates)
+
+    for batch_rows in (None, 7):
+        with transform.shard_pool(2, release_dates) as pool:
+            state, _ = transform.refresh_source_cache(
+                items, release_dates, {}, batch_rows, pool=pool, workers=2
+            )
+        cached_jsonl, cached_parquet = transform._cache_paths("src_1")
+        assert cached_jsonl.read_text() == expected
+        assert pd.read_parquet(cached_parquet)["model"].tolist() == [
+            json.loads(line)["model"] for line in expected.splitlines()
+        ]
+        assert state["sources"]["src_1"]["summary"]["rows"] == len(METR_SHAPED_RUNS) * 10